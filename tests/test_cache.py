@@ -6,234 +6,259 @@ Usage:
     uv run pytest tests/test_cache.py -v -s
 """
 
-import tempfile
-from pathlib import Path
+import sys
 import pytest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 from url2md.cache import Cache, CacheResult
 from url2md.urlinfo import URLInfo
 
 
-def test_cache_initialization():
+@pytest.fixture
+def mock_get():
+    """Patch requests.get to stream a small HTML page in two chunks"""
+    response = MagicMock(headers={'content-type': 'text/html; charset=utf-8'})
+    response.__enter__.return_value = response
+    response.iter_content.return_value = [b'<html>', b'</html>']
+    with patch('url2md.urlinfo.requests.get', return_value=response) as mock:
+        yield mock
+
+
+def test_cache_initialization(tmp_path):
     """Test Cache initialization"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        cache_dir = Path(temp_dir)
-        cache = Cache(cache_dir)
-        
-        # Check directory creation
-        assert cache.content_dir.exists(), "Content directory not created"
-        assert cache.tsv_path.parent.exists(), "Cache directory not created"
+    cache_dir = tmp_path
+    cache = Cache(cache_dir)
+    
+    # Check directory creation
+    assert cache.content_dir.exists(), "Content directory not created"
+    assert cache.tsv_path.parent.exists(), "Cache directory not created"
 
 
-def test_cache_data_operations():
+def test_cache_data_operations(tmp_path):
     """Test cache data read/write operations"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        cache_dir = Path(temp_dir)
-        cache = Cache(cache_dir)
-        
-        # Create test URLInfo
-        url_info = URLInfo(
-            url='https://example.com/test',
-            filename='test.html',
-            fetch_date='2023-01-01T00:00:00',
-            status='success',
-            content_type='text/html',
-            size=1024
-        )
-        
-        # Test add and get
-        cache.add(url_info)
-        retrieved = cache.get(url_info.url)
-        
-        assert retrieved is not None, "Failed to retrieve added URLInfo"
-        assert retrieved.url == url_info.url, "URL mismatch"
-        assert retrieved.hash == url_info.hash, "Hash mismatch"
-        
-        # Test exists
-        assert cache.exists(url_info.url), "exists() returned False for added URL"
-        assert not cache.exists('https://nonexistent.com'), "exists() returned True for non-existent URL"
-        
-        # Test get_all
-        all_entries = cache.get_all()
-        assert len(all_entries) == 1, "get_all() returned wrong count"
-        assert all_entries[0].url == url_info.url, "get_all() returned wrong URLInfo"
+    cache_dir = tmp_path
+    cache = Cache(cache_dir)
+    
+    # Create test URLInfo
+    url_info = URLInfo(
+        url='https://example.com/test',
+        filename='test.html',
+        fetch_date='2023-01-01T00:00:00',
+        status='success',
+        content_type='text/html',
+        size=1024
+    )
+    
+    # Test add and get
+    cache.add(url_info)
+    retrieved = cache.get(url_info.url)
+    
+    assert retrieved is not None, "Failed to retrieve added URLInfo"
+    assert retrieved.url == url_info.url, "URL mismatch"
+    assert retrieved.hash == url_info.hash, "Hash mismatch"
+    
+    # Test exists
+    assert cache.exists(url_info.url), "exists() returned False for added URL"
+    assert not cache.exists('https://nonexistent.com'), "exists() returned True for non-existent URL"
+    
+    # Test get_all
+    all_entries = cache.get_all()
+    assert len(all_entries) == 1, "get_all() returned wrong count"
+    assert all_entries[0].url == url_info.url, "get_all() returned wrong URLInfo"
 
 
-def test_cache_persistence():
+def test_cache_persistence(tmp_path):
     """Test cache persistence across instances"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        cache_dir = Path(temp_dir)
-        
-        # Create first cache instance and add data
-        cache1 = Cache(cache_dir)
-        url_info = URLInfo(
-            url='https://example.com/test',
-            filename='test.html',
-            fetch_date='2023-01-01T00:00:00',
-            status='success',
-            content_type='text/html',
-            size=1024
-        )
-        cache1.add(url_info)
-        cache1.save()
-        
-        # Create second cache instance and load data
-        cache2 = Cache(cache_dir)
-        retrieved = cache2.get(url_info.url)
-        
-        assert retrieved is not None, "Failed to load data in new cache instance"
-        assert retrieved.url == url_info.url, "Loaded data mismatch"
+    cache_dir = tmp_path
+    
+    # Create first cache instance and add data
+    cache1 = Cache(cache_dir)
+    url_info = URLInfo(
+        url='https://example.com/test',
+        filename='test.html',
+        fetch_date='2023-01-01T00:00:00',
+        status='success',
+        content_type='text/html',
+        size=1024
+    )
+    cache1.add(url_info)
+    cache1.save()
+    
+    # Create second cache instance and load data
+    cache2 = Cache(cache_dir)
+    retrieved = cache2.get(url_info.url)
+    
+    assert retrieved is not None, "Failed to load data in new cache instance"
+    assert retrieved.url == url_info.url, "Loaded data mismatch"
 
 
-def test_cache_tsv_format():
+def test_cache_tsv_format(tmp_path):
     """Test cache.tsv format"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        cache_dir = Path(temp_dir)
-        cache = Cache(cache_dir)
-        
-        # Add test data
-        url_info = URLInfo(
-            url='https://example.com/test',
-            filename='test.html',
-            fetch_date='2023-01-01T00:00:00',
-            status='success',
-            content_type='text/html',
-            size=1024
-        )
-        cache.add(url_info)
-        cache.save()
-        
-        # Check TSV file format
-        tsv_path = cache.tsv_path
-        assert tsv_path.exists(), "TSV file not created"
-        
-        with open(tsv_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        assert len(lines) >= 2, "TSV file should have header + data lines"
-        
-        # Check header
-        header = lines[0].strip().split('\t')
-        expected_header = ['url', 'hash', 'filename', 'fetch_date', 'status', 'content_type', 'size', 'error']
-        assert header == expected_header, f"Header mismatch: got {header}"
-        
-        # Check data line
-        data_line = lines[1].strip().split('\t')
-        assert data_line[0] == url_info.url, "URL mismatch in TSV"
-        assert data_line[1] == url_info.hash, "Hash mismatch in TSV"
-        assert data_line[2] == url_info.filename, "Filename mismatch in TSV"
+    cache_dir = tmp_path
+    cache = Cache(cache_dir)
+    
+    # Add test data
+    url_info = URLInfo(
+        url='https://example.com/test',
+        filename='test.html',
+        fetch_date='2023-01-01T00:00:00',
+        status='success',
+        content_type='text/html',
+        size=1024
+    )
+    cache.add(url_info)
+    cache.save()
+    
+    # Check TSV file format
+    tsv_path = cache.tsv_path
+    assert tsv_path.exists(), "TSV file not created"
+    
+    with open(tsv_path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    
+    assert len(lines) >= 2, "TSV file should have header + data lines"
+    
+    # Check header
+    header = lines[0].strip().split('\t')
+    expected_header = ['url', 'hash', 'filename', 'fetch_date', 'status', 'content_type', 'size', 'error']
+    assert header == expected_header, f"Header mismatch: got {header}"
+    
+    # Check data line
+    data_line = lines[1].strip().split('\t')
+    assert data_line[0] == url_info.url, "URL mismatch in TSV"
+    assert data_line[1] == url_info.hash, "Hash mismatch in TSV"
+    assert data_line[2] == url_info.filename, "Filename mismatch in TSV"
 
 
-def test_summary_path_generation():
+def test_summary_path_generation(tmp_path):
     """Test summary file path generation"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        cache_dir = Path(temp_dir)
-        cache = Cache(cache_dir)
-        
-        # Test URLInfo
-        url_info = URLInfo(
-            url='https://example.com/test',
-            filename='test123.html',
-            fetch_date='2023-01-01T00:00:00',
-            status='success',
-            content_type='text/html',
-            size=1024
-        )
-        
-        # Test summary path
-        summary_path = cache.get_summary_path(url_info)
-        assert summary_path is not None, "Summary path is None"
-        assert summary_path.suffix == '.json', "Summary path should have .json extension"
-        assert summary_path.stem == 'test123', "Summary path stem should match filename stem"
-        
-        # Test with URLInfo without filename
-        url_info_no_filename = URLInfo(
-            url='https://example.com/test2',
-            filename='',
-            fetch_date='2023-01-01T00:00:00',
-            status='success',
-            content_type='text/html',
-            size=0
-        )
-        
-        summary_path_none = cache.get_summary_path(url_info_no_filename)
-        assert summary_path_none is None, "Summary path should be None for empty filename"
+    cache_dir = tmp_path
+    cache = Cache(cache_dir)
+    
+    # Test URLInfo
+    url_info = URLInfo(
+        url='https://example.com/test',
+        filename='test123.html',
+        fetch_date='2023-01-01T00:00:00',
+        status='success',
+        content_type='text/html',
+        size=1024
+    )
+    
+    # Test summary path
+    summary_path = cache.get_summary_path(url_info)
+    assert summary_path is not None, "Summary path is None"
+    assert summary_path.suffix == '.json', "Summary path should have .json extension"
+    assert summary_path.stem == 'test123', "Summary path stem should match filename stem"
+    
+    # Only the last extension is replaced, as with Path.stem
+    for filename in ('abc-1.tar.gz', 'noext', '.hidden'):
+        url_info.filename = filename
+        assert cache.get_summary_path(url_info).name == f"{Path(filename).stem}.json"
+    
+    # Test with URLInfo without filename
+    url_info_no_filename = URLInfo(
+        url='https://example.com/test2',
+        filename='',
+        fetch_date='2023-01-01T00:00:00',
+        status='success',
+        content_type='text/html',
+        size=0
+    )
+    
+    summary_path_none = cache.get_summary_path(url_info_no_filename)
+    assert summary_path_none is None, "Summary path should be None for empty filename"
 
 
-def test_content_path_generation():
+def test_summary_directory_created_once(tmp_path):
+    """Test that the summary directory is created on first use only"""
+    cache = Cache(tmp_path)
+    summary_dir = cache.create_summary_directory()
+    assert summary_dir == tmp_path / "summary"
+    assert summary_dir.is_dir()
+    
+    with patch('url2md.cache.Path.mkdir') as mock_mkdir:
+        assert cache.create_summary_directory() == summary_dir
+        mock_mkdir.assert_not_called()
+    
+    # reload() forgets the directory, so it is checked again
+    summary_dir.rmdir()
+    cache.reload()
+    assert cache.create_summary_directory().is_dir()
+
+
+def test_content_path_generation(tmp_path):
     """Test content file path generation"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        cache_dir = Path(temp_dir)
-        cache = Cache(cache_dir)
-        
-        url_info = URLInfo(
-            url='https://example.com/test',
-            filename='test123.html',
-            fetch_date='2023-01-01T00:00:00',
-            status='success',
-            content_type='text/html',
-            size=1024
-        )
-        
-        content_path = cache.get_content_path(url_info)
-        assert content_path == cache.content_dir / url_info.filename, "Content path mismatch"
+    cache_dir = tmp_path
+    cache = Cache(cache_dir)
+    
+    url_info = URLInfo(
+        url='https://example.com/test',
+        filename='test123.html',
+        fetch_date='2023-01-01T00:00:00',
+        status='success',
+        content_type='text/html',
+        size=1024
+    )
+    
+    content_path = cache.get_content_path(url_info)
+    assert content_path == cache.content_dir / url_info.filename, "Content path mismatch"
 
 
-def test_filename_collision_handling():
+def test_filename_collision_handling(tmp_path):
     """Test filename collision handling"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        cache_dir = Path(temp_dir)
-        cache = Cache(cache_dir)
-        
-        # Create URLInfo with specific hash
-        url_info = URLInfo(
-            url='https://example.com/test',
-            filename='',  # Will be generated
-            fetch_date='2023-01-01T00:00:00',
-            status='success',
-            content_type='text/html',
-            size=1024
-        )
-        
-        # Find available filename
-        cache.find_available_filename(url_info)
-        assert url_info.filename, "Filename not generated"
-        assert url_info.filename.endswith('.html'), "Filename should have .html extension"
-        
-        # Create the file to simulate collision
-        content_path = cache.get_content_path(url_info)
-        content_path.parent.mkdir(exist_ok=True)
-        content_path.write_text('test content')
-        
-        # Create another URLInfo with same hash
-        url_info2 = URLInfo(
-            url='https://example.com/test2',
-            filename='',
-            fetch_date='2023-01-01T00:00:00',
-            status='success',
-            content_type='text/html',
-            size=1024
-        )
-        url_info2.hash = url_info.hash  # Force same hash
-        
-        # Find available filename (should avoid collision)
-        cache.find_available_filename(url_info2)
-        assert url_info2.filename != url_info.filename, "Collision not avoided"
-        assert '-1' in url_info2.filename, "Counter not added for collision"
+    cache_dir = tmp_path
+    cache = Cache(cache_dir)
+    
+    # Create URLInfo with specific hash
+    url_info = URLInfo(
+        url='https://example.com/test',
+        filename='',  # Will be generated
+        fetch_date='2023-01-01T00:00:00',
+        status='success',
+        content_type='text/html',
+        size=1024
+    )
+    
+    # Find available filename
+    cache.find_available_filename(url_info)
+    assert url_info.filename, "Filename not generated"
+    assert url_info.filename.endswith('.html'), "Filename should have .html extension"
+    
+    # Create the file to simulate collision
+    content_path = cache.get_content_path(url_info)
+    content_path.parent.mkdir(exist_ok=True)
+    content_path.write_text('test content')
+    
+    # Create another URLInfo with same hash
+    url_info2 = URLInfo(
+        url='https://example.com/test2',
+        filename='',
+        fetch_date='2023-01-01T00:00:00',
+        status='success',
+        content_type='text/html',
+        size=1024
+    )
+    url_info2.hash = url_info.hash  # Force same hash
+    
+    # Find available filename (should avoid collision)
+    cache.find_available_filename(url_info2)
+    assert url_info2.filename != url_info.filename, "Collision not avoided"
+    assert '-1' in url_info2.filename, "Counter not added for collision"
 
 
-def test_domain_throttling():
+def test_domain_throttling(tmp_path):
     """Test domain-based throttling functionality"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        cache_dir = Path(temp_dir)
-        cache = Cache(cache_dir)
-        
-        # Test wait_for_domain_throttle method
-        # This is mainly a smoke test since we can't easily test timing
-        try:
-            cache.wait_for_domain_throttle('example.com', wait_seconds=0.1)
-        except Exception as e:
-            pytest.fail(f"Domain throttling failed: {e}")
+    cache_dir = tmp_path
+    cache = Cache(cache_dir)
+    
+    # Test wait_for_domain_throttle method
+    # This is mainly a smoke test since we can't easily test timing
+    try:
+        cache.wait_for_domain_throttle('example.com', wait_seconds=0.1)
+    except Exception as e:
+        pytest.fail(f"Domain throttling failed: {e}")
 
 
 def test_cache_result():
@@ -256,4 +281,207 @@ def test_cache_result():
     # Test failed result
     failed_result = CacheResult(success=False, url_info=url_info, downloaded=False)
     assert failed_result.success is False
-    assert failed_result.downloaded is False
\ No newline at end of file
+    assert failed_result.downloaded is False
+
+
+def test_domain_throttling_waits_remaining_time(tmp_path):
+    """Test that throttling sleeps only for the rest of the interval"""
+    cache = Cache(tmp_path)
+    
+    with patch('url2md.cache.time.sleep') as mock_sleep, \
+         patch('url2md.cache.time.monotonic') as mock_monotonic:
+        # Unvisited domain: no wait
+        cache.wait_for_domain_throttle('example.com', wait_seconds=5)
+        mock_sleep.assert_not_called()
+        
+        # Recently accessed domain: wait for the remaining interval only
+        mock_monotonic.return_value = 100.0
+        cache.add(URLInfo(url='https://example.com/a', filename='', fetch_date='',
+                          status='', content_type='', size=0))
+        mock_monotonic.return_value = 102.0
+        cache.wait_for_domain_throttle('example.com', wait_seconds=5)
+        mock_sleep.assert_called_once_with(3.0)
+        
+        # Interval already elapsed: no wait
+        mock_sleep.reset_mock()
+        mock_monotonic.return_value = 106.0
+        cache.wait_for_domain_throttle('example.com', wait_seconds=5)
+        mock_sleep.assert_not_called()
+
+
+def test_cache_interns_urls(tmp_path):
+    """Test that cached URLs are interned for identity-based lookups"""
+    cache_dir = tmp_path
+    cache = Cache(cache_dir)
+    url = ''.join(['https://example.com/', 'interned'])  # Built at runtime, not a literal
+    cache.add(URLInfo(url=url, filename='test.html', fetch_date='2023-01-01T00:00:00',
+                      status='success', content_type='text/html', size=1))
+    cache.save()
+    
+    assert cache.get(url).url is sys.intern(url)
+    assert Cache(cache_dir).get(url).url is sys.intern(url)
+
+
+def test_filename_collision_multiple_existing_files(tmp_path):
+    """Test collision probing against existing files and names chosen earlier"""
+    cache_dir = tmp_path
+    cache = Cache(cache_dir)
+    
+    url_info = URLInfo(url='https://example.com/test', filename='', fetch_date='2023-01-01T00:00:00',
+                       status='success', content_type='text/html', size=0)
+    
+    # Files written before the cache instance scanned content_dir
+    (cache.content_dir / f"{url_info.hash}.html").write_text('existing')
+    (cache.content_dir / f"{url_info.hash}-1.html").write_text('existing')
+    
+    cache.find_available_filename(url_info)
+    assert url_info.filename == f"{url_info.hash}-2.html"
+    
+    # A name chosen earlier is not handed out again, even before its file is written
+    cache.find_available_filename(url_info)
+    assert url_info.filename == f"{url_info.hash}-3.html"
+
+
+def test_cache_iteration_and_length(tmp_path):
+    """Test iterating over the cache and taking its length without get_all()"""
+    cache = Cache(tmp_path)
+    assert len(cache) == 0
+    assert list(cache) == []
+    
+    urls = ['https://example.com/a', 'https://example.com/b']
+    for url in urls:
+        cache.add(URLInfo(url=url, filename='', fetch_date='', status='', content_type='', size=0))
+    
+    assert len(cache) == 2
+    assert [url_info.url for url_info in cache] == urls
+    assert list(cache) == cache.get_all()
+
+
+def test_cache_add_many(tmp_path):
+    """Test bulk insertion with add_many"""
+    cache = Cache(tmp_path)
+    url_infos = [
+        URLInfo(url=f'https://example.com/{i}', filename=f'{i}.html', fetch_date='2023-01-01T00:00:00',
+                status='success', content_type='text/html', size=i)
+        for i in range(5)
+    ]
+    cache.add_many(url_infos)
+    cache.save()
+    
+    assert len(cache) == 5
+    assert cache.get('https://example.com/3').size == 3
+    
+    # Persisted in one append, readable by a new instance
+    reloaded = Cache(tmp_path)
+    assert [url_info.url for url_info in reloaded] == [url_info.url for url_info in url_infos]
+
+
+def test_fetch_appends_single_row(tmp_path, mock_get):
+    """Test that a successful fetch appends its row instead of rewriting cache.tsv"""
+    cache = Cache(tmp_path)
+    cache.add(URLInfo(url='https://example.com/old', filename='old.html', fetch_date='2023-01-01T00:00:00',
+                      status='success', content_type='text/html', size=1))
+    cache.save()
+    first_content = cache.tsv_path.read_text()
+    
+    with patch.object(Cache, 'compact') as mock_compact:
+        result = cache.fetch_and_cache_url('https://example.com/new', throttle_seconds=0)
+    
+    assert result.success
+    mock_compact.assert_not_called()
+    tsv_content = cache.tsv_path.read_text()
+    assert tsv_content.startswith(first_content)
+    assert tsv_content[len(first_content):].count('\n') == 1
+    assert Cache(tmp_path).get('https://example.com/new').size == len('<html></html>')
+
+
+def test_fetch_skips_file_created_after_snapshot(tmp_path, mock_get):
+    """Test that fetch never overwrites a content file missing from the snapshot"""
+    cache = Cache(tmp_path)
+    url = 'https://example.com/new'
+    
+    # Take the content_dir snapshot, then create the target name behind its back
+    cache.find_available_filename(URLInfo(url='https://example.com/other', filename='', fetch_date='',
+                                          status='', content_type='', size=0))
+    url_hash = URLInfo(url=url, filename='', fetch_date='', status='', content_type='', size=0).hash
+    existing = cache.content_dir / f"{url_hash}.html"
+    existing.write_text('other process')
+    
+    result = cache.fetch_and_cache_url(url, throttle_seconds=0)
+    
+    assert result.url_info.filename == f"{url_hash}-1.html"
+    assert existing.read_text() == 'other process'
+    assert cache.get_content_path(result.url_info).read_text() == '<html></html>'
+
+
+def test_fetch_streams_content_to_file(tmp_path, mock_get):
+    """Test that fetched chunks are written to the content file and counted"""
+    cache = Cache(tmp_path)
+    result = cache.fetch_and_cache_url('https://example.com/page', throttle_seconds=0)
+    
+    assert result.success
+    assert result.url_info.content_type == 'text/html'
+    assert result.url_info.size == len('<html></html>')
+    assert cache.get_content_path(result.url_info).read_bytes() == b'<html></html>'
+    assert mock_get.call_args.kwargs['stream'] is True
+
+
+def test_fetch_failure_removes_partial_file(tmp_path, mock_get):
+    """Test that a download failing midway leaves no content file behind"""
+    def interrupted(chunk_size):
+        yield b'<html>'
+        raise ConnectionError("Connection reset")
+    mock_get.return_value.iter_content.side_effect = interrupted
+    
+    cache = Cache(tmp_path)
+    result = cache.fetch_and_cache_url('https://example.com/page', throttle_seconds=0)
+    
+    assert not result.success
+    assert result.url_info.status == 'error'
+    assert result.url_info.error == 'Connection reset'
+    assert result.url_info.filename == ''
+    assert list(cache.content_dir.iterdir()) == []
+    
+    # The error row does not name the removed file
+    assert Cache(tmp_path).get('https://example.com/page').filename == ''
+
+
+def test_fetch_retry_after_failure_reuses_filename(tmp_path, mock_get):
+    """Test that a retry after a failed fetch gets the unsuffixed filename"""
+    def interrupted(chunk_size):
+        yield b'<html>'
+        raise ConnectionError("Connection reset")
+    mock_get.return_value.iter_content.side_effect = interrupted
+    
+    cache = Cache(tmp_path)
+    url = 'https://example.com/page'
+    assert not cache.fetch_and_cache_url(url, throttle_seconds=0).success
+    
+    # The removed partial file no longer blocks its name
+    mock_get.return_value.iter_content.side_effect = None
+    result = cache.fetch_and_cache_url(url, throttle_seconds=0)
+    
+    assert result.success
+    assert result.url_info.filename == f"{result.url_info.hash}.html"
+    assert cache.get_content_path(result.url_info).read_bytes() == b'<html></html>'
+
+
+def test_fetch_retry_failure_keeps_previous_filename(tmp_path, mock_get):
+    """Test that a retry failing midway keeps the filename recorded before it"""
+    def interrupted(chunk_size):
+        yield b'<html>'
+        raise ConnectionError("Connection reset")
+    mock_get.return_value.iter_content.side_effect = interrupted
+    
+    # Earlier success whose content file has gone missing, so the URL is retried
+    cache = Cache(tmp_path)
+    cache.add(URLInfo(url='https://example.com/page', filename='old.html', fetch_date='2023-01-01T00:00:00',
+                      status='success', content_type='text/html', size=1))
+    cache.save()
+    
+    result = cache.fetch_and_cache_url('https://example.com/page', throttle_seconds=0)
+    
+    assert not result.success
+    assert result.url_info.filename == 'old.html'
+    assert list(cache.content_dir.iterdir()) == []
+    assert Cache(tmp_path).get('https://example.com/page').filename == 'old.html'
@@ -3,132 +3,244 @@
 Test cache IO operations and TSV management functionality
 """
 
-import tempfile
-from pathlib import Path
 
 from url2md.cache import Cache
 from url2md.urlinfo import URLInfo
 
 
-def test_cache_tsv_save_and_load():
+def test_cache_tsv_save_and_load(tmp_path):
     """Test TSV content and cache state during save/load operations"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        cache_dir = Path(temp_dir)
-        cache = Cache(cache_dir)
-        url_info = URLInfo(
-            url='https://example.com/test',
-            filename='test.html',
-            fetch_date='2023-01-01T00:00:00',
-            status='success',
-            content_type='text/html',
-            size=1024
-        )
-        cache.add(url_info)
-        cache.save()
-        
-        # Check TSV content
-        tsv_content = cache.tsv_path.read_text()
-        expected_header = 'url\thash\tfilename\tfetch_date\tstatus\tcontent_type\tsize\terror\n'
-        expected_data = 'https://example.com/test\t910d8f18ffe4e3389648f2a252c38786\ttest.html\t2023-01-01T00:00:00\tsuccess\ttext/html\t1024\t\n'
-        expected_content = expected_header + expected_data
-        
-        assert tsv_content == expected_content
-        assert len(cache._entries) == 1
-        assert cache.header == ['url', 'hash', 'filename', 'fetch_date', 'status', 'content_type', 'size', 'error']
-        assert len(cache.data) == 1
-        assert cache.data[0] == ['https://example.com/test', '910d8f18ffe4e3389648f2a252c38786', 'test.html', '2023-01-01T00:00:00', 'success', 'text/html', '1024', '']
-
-
-def test_cache_new_instance_loading():
+    cache_dir = tmp_path
+    cache = Cache(cache_dir)
+    url_info = URLInfo(
+        url='https://example.com/test',
+        filename='test.html',
+        fetch_date='2023-01-01T00:00:00',
+        status='success',
+        content_type='text/html',
+        size=1024
+    )
+    cache.add(url_info)
+    cache.save()
+    
+    # Check TSV content
+    tsv_content = cache.tsv_path.read_text()
+    expected_header = 'url\thash\tfilename\tfetch_date\tstatus\tcontent_type\tsize\terror\n'
+    expected_data = 'https://example.com/test\t910d8f18ffe4e3389648f2a252c38786\ttest.html\t2023-01-01T00:00:00\tsuccess\ttext/html\t1024\t\n'
+    expected_content = expected_header + expected_data
+    
+    assert tsv_content == expected_content
+    assert len(cache._entries) == 1
+    assert cache.header == ['url', 'hash', 'filename', 'fetch_date', 'status', 'content_type', 'size', 'error']
+    assert len(cache.data) == 1
+    assert cache.data[0] == ['https://example.com/test', '910d8f18ffe4e3389648f2a252c38786', 'test.html', '2023-01-01T00:00:00', 'success', 'text/html', '1024', '']
+
+
+def test_cache_new_instance_loading(tmp_path):
     """Test loading data in new cache instance"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        cache_dir = Path(temp_dir)
-        
-        # Create and save data
-        cache1 = Cache(cache_dir)
-        url_info = URLInfo(
-            url='https://example.com/test',
-            filename='test.html',
-            fetch_date='2023-01-01T00:00:00',
-            status='success',
-            content_type='text/html',
-            size=1024
-        )
-        cache1.add(url_info)
-        cache1.save()
-        assert len(cache1._entries) == 1
-        
-        # Create new instance and load
-        cache2 = Cache(cache_dir)
-        assert cache2.header == ['url', 'hash', 'filename', 'fetch_date', 'status', 'content_type', 'size', 'error']
-        assert len(cache2.data) == 1
-        assert cache2.data[0] == ['https://example.com/test', '910d8f18ffe4e3389648f2a252c38786', 'test.html', '2023-01-01T00:00:00', 'success', 'text/html', '1024', '']
-        assert len(cache2._entries) == 1
-        
-        retrieved = cache2.get('https://example.com/test')
-        assert retrieved is not None
-        assert retrieved.url == 'https://example.com/test'
-        assert retrieved.filename == 'test.html'
-        assert retrieved.status == 'success'
-
-
-def test_tsv_empty_field_handling():
+    cache_dir = tmp_path
+    
+    # Create and save data
+    cache1 = Cache(cache_dir)
+    url_info = URLInfo(
+        url='https://example.com/test',
+        filename='test.html',
+        fetch_date='2023-01-01T00:00:00',
+        status='success',
+        content_type='text/html',
+        size=1024
+    )
+    cache1.add(url_info)
+    cache1.save()
+    assert len(cache1._entries) == 1
+    
+    # Create new instance and load
+    cache2 = Cache(cache_dir)
+    assert cache2.header == ['url', 'hash', 'filename', 'fetch_date', 'status', 'content_type', 'size', 'error']
+    assert len(cache2.data) == 1
+    assert cache2.data[0] == ['https://example.com/test', '910d8f18ffe4e3389648f2a252c38786', 'test.html', '2023-01-01T00:00:00', 'success', 'text/html', '1024', '']
+    assert len(cache2._entries) == 1
+    
+    retrieved = cache2.get('https://example.com/test')
+    assert retrieved is not None
+    assert retrieved.url == 'https://example.com/test'
+    assert retrieved.filename == 'test.html'
+    assert retrieved.status == 'success'
+
+
+def test_tsv_empty_field_handling(tmp_path):
     """Test handling of empty fields in TSV data"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        cache_dir = Path(temp_dir)
-        
-        # Create URL info with empty error field
-        cache = Cache(cache_dir)
-        url_info = URLInfo(
-            url='https://example.com/empty-error',
-            filename='test.html',
-            fetch_date='2023-01-01T00:00:00',
-            status='success',
-            content_type='text/html',
-            size=1024,
-            error=''  # Empty error field
-        )
-        cache.add(url_info)
-        cache.save()
-        
-        # Verify TSV content handles empty field correctly
-        tsv_content = cache.tsv_path.read_text()
-        lines = tsv_content.split('\n')  # Don't strip to preserve trailing tabs
-        data_line = lines[1]
-        fields = data_line.split('\t')
-        
-        # Should have 8 fields, with last one being empty
-        assert len(fields) == 8
-        assert fields[-1] == ''  # Empty error field
-        
-        # Reload and verify
-        new_cache = Cache(cache_dir)
-        retrieved = new_cache.get('https://example.com/empty-error')
-        assert retrieved is not None
-        assert retrieved.error == ''
-
-
-def test_tsv_missing_columns_padding():
+    cache_dir = tmp_path
+    
+    # Create URL info with empty error field
+    cache = Cache(cache_dir)
+    url_info = URLInfo(
+        url='https://example.com/empty-error',
+        filename='test.html',
+        fetch_date='2023-01-01T00:00:00',
+        status='success',
+        content_type='text/html',
+        size=1024,
+        error=''  # Empty error field
+    )
+    cache.add(url_info)
+    cache.save()
+    
+    # Verify TSV content handles empty field correctly
+    tsv_content = cache.tsv_path.read_text()
+    lines = tsv_content.split('\n')  # Don't strip to preserve trailing tabs
+    data_line = lines[1]
+    fields = data_line.split('\t')
+    
+    # Should have 8 fields, with last one being empty
+    assert len(fields) == 8
+    assert fields[-1] == ''  # Empty error field
+    
+    # Reload and verify
+    new_cache = Cache(cache_dir)
+    retrieved = new_cache.get('https://example.com/empty-error')
+    assert retrieved is not None
+    assert retrieved.error == ''
+
+
+def test_tsv_missing_columns_padding(tmp_path):
     """Test padding of TSV rows with missing columns"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        cache_dir = Path(temp_dir)
-        
-        # Manually create TSV with missing error column
-        tsv_path = cache_dir / "cache.tsv"
-        cache_dir.mkdir(exist_ok=True)
-        
-        # Write TSV with 7 columns (missing error column)
-        with open(tsv_path, 'w', encoding='utf-8') as f:
-            f.write('url\thash\tfilename\tfetch_date\tstatus\tcontent_type\tsize\n')
-            f.write('https://example.com/test\t910d8f18ffe4e3389648f2a252c38786\ttest.html\t2023-01-01T00:00:00\tsuccess\ttext/html\t1024\n')
-        
-        # Load cache and verify padding works
-        cache = Cache(cache_dir)
-        assert len(cache.data) == 1
-        assert len(cache.data[0]) == 8  # Should be padded to 8 columns
-        assert cache.data[0][-1] == ''  # Padded error field should be empty
-        
-        retrieved = cache.get('https://example.com/test')
-        assert retrieved is not None
-        assert retrieved.url == 'https://example.com/test'
-        assert retrieved.error == ''  # Should default to empty string
\ No newline at end of file
+    cache_dir = tmp_path
+    
+    # Manually create TSV with missing error column
+    tsv_path = cache_dir / "cache.tsv"
+    cache_dir.mkdir(exist_ok=True)
+    
+    # Write TSV with 7 columns (missing error column)
+    with open(tsv_path, 'w', encoding='utf-8') as f:
+        f.write('url\thash\tfilename\tfetch_date\tstatus\tcontent_type\tsize\n')
+        f.write('https://example.com/test\t910d8f18ffe4e3389648f2a252c38786\ttest.html\t2023-01-01T00:00:00\tsuccess\ttext/html\t1024\n')
+    
+    # Load cache and verify padding works
+    cache = Cache(cache_dir)
+    assert len(cache.data) == 1
+    assert len(cache.data[0]) == 8  # Should be padded to 8 columns
+    assert cache.data[0][-1] == ''  # Padded error field should be empty
+    
+    retrieved = cache.get('https://example.com/test')
+    assert retrieved is not None
+    assert retrieved.url == 'https://example.com/test'
+    assert retrieved.error == ''  # Should default to empty string
+
+
+def test_cache_save_appends_new_entries(tmp_path):
+    """Test that save appends only entries added since the last save"""
+    cache_dir = tmp_path
+    cache = Cache(cache_dir)
+    cache.add(URLInfo(url='https://example.com/a', filename='a.html', fetch_date='2023-01-01T00:00:00',
+                      status='success', content_type='text/html', size=1))
+    cache.save()
+    first_content = cache.tsv_path.read_text()
+    
+    cache.add(URLInfo(url='https://example.com/b', filename='b.html', fetch_date='2023-01-01T00:00:00',
+                      status='success', content_type='text/html', size=2))
+    cache.save()
+    
+    # Existing content is kept as-is and the new row is appended
+    tsv_content = cache.tsv_path.read_text()
+    assert tsv_content.startswith(first_content)
+    assert tsv_content[len(first_content):].startswith('https://example.com/b\t')
+    assert len(cache.data) == 2
+    
+    # Saving without changes does not touch the file
+    cache.save()
+    assert cache.tsv_path.read_text() == tsv_content
+
+
+def test_cache_updated_entry_compaction(tmp_path):
+    """Test that updated entries win on reload and stale rows are compacted"""
+    cache_dir = tmp_path
+    cache = Cache(cache_dir)
+    url_info = URLInfo(url='https://example.com/test', filename='', fetch_date='2023-01-01T00:00:00',
+                       status='error', content_type='', size=0, error='timeout')
+    cache.add(url_info)
+    cache.save()
+    
+    # First update is appended, leaving one stale row
+    url_info.status = 'success'
+    url_info.error = ''
+    cache.add(url_info)
+    cache.save()
+    assert len(cache.tsv_path.read_text().splitlines()) == 3
+    
+    # Latest row wins when loading
+    reloaded = Cache(cache_dir)
+    assert len(reloaded.get_all()) == 1
+    assert reloaded.get('https://example.com/test').status == 'success'
+    
+    # Second update makes stale rows the majority and triggers compaction
+    reloaded.add(reloaded.get('https://example.com/test'))
+    reloaded.save()
+    lines = reloaded.tsv_path.read_text().splitlines()
+    assert len(lines) == 2
+    assert lines[1].split('\t')[4] == 'success'
+
+
+def test_cache_reload(tmp_path):
+    """Test that reload picks up saved rows and drops unsaved entries"""
+    cache_dir = tmp_path
+    cache = Cache(cache_dir)
+    writer = Cache(cache_dir)
+    writer.add(URLInfo(url='https://example.com/a', filename='a.html', fetch_date='2023-01-01T00:00:00',
+                       status='success', content_type='text/html', size=1))
+    writer.save()
+    cache.add(URLInfo(url='https://example.com/unsaved', filename='', fetch_date='2023-01-01T00:00:00',
+                      status='error', content_type='', size=0))
+    
+    cache.reload()
+    assert cache.exists('https://example.com/a')
+    assert not cache.exists('https://example.com/unsaved')
+    assert len(cache) == 1
+    
+    # Nothing is pending after a reload
+    content = cache.tsv_path.read_text()
+    cache.save()
+    assert cache.tsv_path.read_text() == content
+
+
+def test_tsv_blank_lines_and_crlf(tmp_path):
+    """Test loading TSV files with blank lines and CRLF line endings"""
+    cache_dir = tmp_path
+    tsv_path = cache_dir / "cache.tsv"
+    
+    with open(tsv_path, 'w', encoding='utf-8', newline='') as f:
+        f.write('url\thash\tfilename\tfetch_date\tstatus\tcontent_type\tsize\terror\r\n')
+        f.write('\r\n')
+        f.write('https://example.com/test\t910d8f18ffe4e3389648f2a252c38786\ttest.html\t2023-01-01T00:00:00\tsuccess\ttext/html\t1024\t\r\n')
+    
+    cache = Cache(cache_dir)
+    assert cache.header == ['url', 'hash', 'filename', 'fetch_date', 'status', 'content_type', 'size', 'error']
+    assert cache.data == [['https://example.com/test', '910d8f18ffe4e3389648f2a252c38786', 'test.html', '2023-01-01T00:00:00', 'success', 'text/html', '1024', '']]
+    assert cache.get('https://example.com/test').size == 1024
+
+
+def test_cache_append_after_truncated_row(tmp_path):
+    """Test that an append does not merge with a last row that lacks a newline"""
+    cache_dir = tmp_path
+    cache = Cache(cache_dir)
+    cache.add(URLInfo(url='https://example.com/a', filename='a.html', fetch_date='2023-01-01T00:00:00',
+                      status='success', content_type='text/html', size=1))
+    cache.save()
+    
+    # Simulate a write interrupted in the middle of a row
+    with open(cache.tsv_path, 'a', encoding='utf-8') as f:
+        f.write('https://example.com/partial\tabc')
+    
+    cache = Cache(cache_dir)
+    cache.add(URLInfo(url='https://example.com/b', filename='b.html', fetch_date='2023-01-01T00:00:00',
+                      status='success', content_type='text/html', size=2))
+    cache.save()
+    
+    lines = cache.tsv_path.read_text().splitlines()
+    assert lines[-2] == 'https://example.com/partial\tabc'
+    assert lines[-1].startswith('https://example.com/b\t')
+    
+    # The truncated row is ignored on load
+    reloaded = Cache(cache_dir)
+    assert [url_info.url for url_info in reloaded] == ['https://example.com/a', 'https://example.com/b']
+    assert reloaded.get('https://example.com/b').filename == 'b.html'
@@ -5,11 +5,8 @@ Integration tests for url2md package
 These tests verify that different components work together correctly.
 """
 
-import tempfile
-import os
-from pathlib import Path
+import importlib.util
 import pytest
-import sys
 from unittest.mock import patch, Mock
 
 from url2md.main import main
@@ -17,245 +14,166 @@ from url2md.cache import Cache
 from url2md.urlinfo import URLInfo
 
 
+# Pre-serialized summary file written by the cache integration test
+SUMMARY_JSON = (
+    b'{"title": ["Test Page"], "summary_one_line": "Test summary", '
+    b'"summary_detailed": "Detailed test summary", "tags": ["test"], '
+    b'"is_valid_content": true}'
+)
+
+# Minimal page for the HTML utility checks
+SAMPLE_HTML = '<html><head><title>Test</title></head><body><p>Content</p></body></html>'
+
+
+@pytest.fixture
+def fetch_success_result():
+    """Successful fetch result mock, built fresh for each test"""
+    return Mock(success=True, downloaded=True)
+
+
+@pytest.fixture(scope="module")
+def schema_configs():
+    """Generation configs for every schema variant, built once per module"""
+    from llm7shi import config_from_schema
+    from url2md.schema import (
+        create_summarize_schema_class,
+        create_classify_schema_class,
+        create_translate_schema_class,
+    )
+
+    return {
+        'summarize': config_from_schema(create_summarize_schema_class()),
+        'summarize/English': config_from_schema(create_summarize_schema_class(language='English')),
+        'classify': config_from_schema(create_classify_schema_class()),
+        'classify/English': config_from_schema(create_classify_schema_class(language='English')),
+        # translate_schema requires terms and language parameters
+        'translate/English': config_from_schema(create_translate_schema_class(['test', 'example'], 'English')),
+    }
+
+
 class TestCommandIntegration:
     """Integration tests for command-line interface"""
     
     def test_main_help(self):
         """Test main help command"""
-        with patch('sys.argv', ['url2md', '--help']):
-            with pytest.raises(SystemExit) as exc_info:
-                from url2md.main import main
-                main()
-            # Help should exit with code 0
-            assert exc_info.value.code == 0
+        with pytest.raises(SystemExit) as exc_info:
+            main(['--help'])
+        # Help should exit with code 0
+        assert exc_info.value.code == 0
     
     def test_subcommand_help(self):
         """Test subcommand help"""
-        with patch('sys.argv', ['url2md', 'fetch', '--help']):
-            with pytest.raises(SystemExit) as exc_info:
-                from url2md.main import main
-                main()
-            # Help should exit with code 0
-            assert exc_info.value.code == 0
+        with pytest.raises(SystemExit) as exc_info:
+            main(['fetch', '--help'])
+        # Help should exit with code 0
+        assert exc_info.value.code == 0
     
     def test_no_command(self):
         """Test main with no command"""
-        with patch('sys.argv', ['url2md']):
-            result = main()
-            assert result == 1  # Should return error code
-    
-    def test_init_command_integration(self):
-        """Test init command creates proper cache structure"""
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Change to temp directory
-            original_cwd = os.getcwd()
-            try:
-                os.chdir(temp_path)
-                
-                # Test init command
-                with patch.object(sys, 'argv', ['url2md', 'init', 'test_cache']):
-                    result = main()
-                    assert result == 0
-                
-                # Verify cache structure was created
-                cache_dir = temp_path / "test_cache"
-                assert cache_dir.exists()
-                assert (cache_dir / "cache.tsv").exists()
-                assert (cache_dir / "content").exists()
-                assert (cache_dir / "summary").exists()
-                
-            finally:
-                os.chdir(original_cwd)
+        result = main([])
+        assert result == 1  # Should return error code
     
-    def test_init_command_existing_cache_fails(self):
-        """Test init command fails when cache already exists"""
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Change to temp directory
-            original_cwd = os.getcwd()
-            try:
-                os.chdir(temp_path)
-                
-                # First init should succeed
-                with patch.object(sys, 'argv', ['url2md', 'init', 'test_cache']):
-                    result = main()
-                    assert result == 0
-                
-                # Second init should fail
-                with patch.object(sys, 'argv', ['url2md', 'init', 'test_cache']):
-                    with pytest.raises(ValueError, match="Cache already exists"):
-                        main()
-                
-            finally:
-                os.chdir(original_cwd)
+    @pytest.fixture
+    def in_tmp_path(self, tmp_path, monkeypatch):
+        """Run the test from tmp_path (working directory restored by monkeypatch)"""
+        monkeypatch.chdir(tmp_path)
+        return tmp_path
     
-    def test_init_command_conflicting_args_fails(self):
-        """Test init command fails when both --cache-dir and directory are specified"""
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Change to temp directory
-            original_cwd = os.getcwd()
-            try:
-                os.chdir(temp_path)
-                
-                # Should fail with conflicting arguments
-                with patch.object(sys, 'argv', ['url2md', '--cache-dir', 'foo', 'init', 'bar']):
-                    with pytest.raises(ValueError, match="Cannot specify both"):
-                        main()
-                
-            finally:
-                os.chdir(original_cwd)
+    @pytest.mark.parametrize("args,cache_name", [
+        (['init', 'test_cache'], 'test_cache'),
+        (['--cache-dir', 'custom_cache', 'init'], 'custom_cache'),
+    ])
+    def test_init_command_creates_cache(self, in_tmp_path, args, cache_name):
+        """Test init command creates proper cache structure"""
+        result = main(args)
+        assert result == 0
+        
+        # Verify cache structure was created
+        cache_dir = in_tmp_path / cache_name
+        assert cache_dir.exists()
+        assert (cache_dir / "cache.tsv").exists()
+        assert (cache_dir / "content").exists()
+        assert (cache_dir / "summary").exists()
     
-    def test_init_command_with_cache_dir_global_option(self):
-        """Test init command with --cache-dir global option"""
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Change to temp directory
-            original_cwd = os.getcwd()
-            try:
-                os.chdir(temp_path)
-                
-                # Should work with --cache-dir
-                with patch.object(sys, 'argv', ['url2md', '--cache-dir', 'custom_cache', 'init']):
-                    result = main()
-                    assert result == 0
-                
-                # Verify cache structure was created in custom location
-                cache_dir = temp_path / "custom_cache"
-                assert cache_dir.exists()
-                assert (cache_dir / "cache.tsv").exists()
-                assert (cache_dir / "content").exists()
-                assert (cache_dir / "summary").exists()
-                
-            finally:
-                os.chdir(original_cwd)
+    @pytest.mark.parametrize("setup_args,args,error", [
+        # Second init on the same directory
+        (['init', 'test_cache'], ['init', 'test_cache'], "Cache already exists"),
+        # Both --cache-dir and directory specified
+        (None, ['--cache-dir', 'foo', 'init', 'bar'], "Cannot specify both"),
+    ])
+    def test_init_command_fails(self, in_tmp_path, setup_args, args, error):
+        """Test init command rejects existing caches and conflicting arguments"""
+        if setup_args:
+            assert main(setup_args) == 0
+        
+        with pytest.raises(ValueError, match=error):
+            main(args)
 
 
 class TestCacheIntegration:
     """Integration tests for cache functionality"""
     
-    def test_cache_urlinfo_integration(self):
+    def test_cache_urlinfo_integration(self, tmp_path):
         """Test Cache and URLInfo integration"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            cache_dir = Path(temp_dir)
-            cache = Cache(cache_dir)
-            
-            # Create URLInfo
-            url_info = URLInfo(
-                url='https://example.com/test',
-                filename='test.html',
-                fetch_date='2023-01-01T00:00:00',
-                status='success',
-                content_type='text/html',
-                size=1024
-            )
-            
-            # Test full workflow
-            cache.add(url_info)
-            cache.save()
-            
-            # Create content file
-            content_path = cache.get_content_path(url_info)
-            content_path.parent.mkdir(exist_ok=True)
-            content_path.write_text('<html><body>Test content</body></html>')
-            
-            # Create summary
-            summary_path = cache.get_summary_path(url_info)
-            summary_path.parent.mkdir(exist_ok=True)
-            summary_data = {
-                'title': ['Test Page'],
-                'summary_one_line': 'Test summary',
-                'summary_detailed': 'Detailed test summary',
-                'tags': ['test'],
-                'is_valid_content': True
-            }
-            
-            import json
-            with open(summary_path, 'w', encoding='utf-8') as f:
-                json.dump(summary_data, f)
-            
-            # Verify integration
-            assert cache.exists(url_info.url)
-            assert content_path.exists()
-            assert summary_path.exists()
-            
-            # Test reload
-            new_cache = Cache(cache_dir)
-            reloaded_info = new_cache.get(url_info.url)
-            assert reloaded_info is not None
-            assert reloaded_info.url == url_info.url
+        cache_dir = tmp_path
+        cache = Cache(cache_dir)
+        
+        # Create URLInfo
+        url_info = URLInfo(
+            url='https://example.com/test',
+            filename='test.html',
+            fetch_date='2023-01-01T00:00:00',
+            status='success',
+            content_type='text/html',
+            size=1024
+        )
+        
+        # Test full workflow
+        cache.add(url_info)
+        cache.save()
+        
+        # Create content file
+        content_path = cache.get_content_path(url_info)
+        content_path.parent.mkdir(exist_ok=True)
+        content_path.write_text('<html><body>Test content</body></html>')
+        
+        # Create summary
+        summary_path = cache.get_summary_path(url_info)
+        summary_path.parent.mkdir(exist_ok=True)
+        summary_path.write_bytes(SUMMARY_JSON)
+        
+        # Verify integration
+        assert cache.exists(url_info.url)
+        assert content_path.exists()
+        assert summary_path.exists()
+        
+        # Test reload
+        cache.reload()
+        reloaded_info = cache.get(url_info.url)
+        assert reloaded_info is not None
+        assert reloaded_info.url == url_info.url
 
 
 class TestWorkflowIntegration:
     """Integration tests for complete workflows"""
     
     @patch('url2md.fetch.Cache.fetch_and_cache_url')
-    def test_fetch_workflow_integration(self, mock_fetch):
+    def test_fetch_workflow_integration(self, mock_fetch, fetch_success_result, tmp_path):
         """Test fetch command workflow"""
         # Mock successful fetch
-        mock_result = Mock()
-        mock_result.success = True
-        mock_result.downloaded = True
-        mock_fetch.return_value = mock_result
+        mock_fetch.return_value = fetch_success_result
+        
+        cache_dir = tmp_path
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            cache_dir = Path(temp_dir)
-            
-            from url2md.main import main as url2md_main
-            import sys
-            from unittest.mock import patch
-            
-            # Test fetch command via main entry point
-            with patch.object(sys, 'argv', ['url2md', '--cache-dir', str(cache_dir), 'fetch', 'https://example.com/test']):
-                result = url2md_main()
-                assert result == 0
-            mock_fetch.assert_called_once()
+        # Test fetch command via main entry point
+        result = main(['--cache-dir', str(cache_dir), 'fetch', 'https://example.com/test'])
+        assert result == 0
+        mock_fetch.assert_called_once()
     
-    def test_schema_module_integration(self):
+    def test_schema_module_integration(self, schema_configs):
         """Test schema module accessibility"""
-        from llm7shi import config_from_schema
-        
-        # Test Pydantic schema class modules
-        schema_modules = [
-            ('schema', 'create_summarize_schema_class'),
-            ('schema', 'create_classify_schema_class'),
-            ('schema', 'create_translate_schema_class'),
-        ]
-        
-        for module_name, function_name in schema_modules:
-            try:
-                module = __import__(f'url2md.{module_name}', fromlist=[function_name])
-                schema_func = getattr(module, function_name)
-                
-                # Test schema creation
-                if function_name == 'create_translate_schema_class':
-                    # translate_schema requires terms and language parameters
-                    schema_class = schema_func(['test', 'example'], 'English')
-                    config = config_from_schema(schema_class)
-                    assert config is not None
-                else:
-                    # Other schemas support optional language parameter
-                    schema_class = schema_func()
-                    config = config_from_schema(schema_class)
-                    assert config is not None
-                    
-                    # Test with language parameter
-                    schema_class_lang = schema_func(language='English')
-                    config_lang = config_from_schema(schema_class_lang)
-                    assert config_lang is not None
-                
-            except Exception as e:
-                pytest.fail(f"Failed to create config from {module_name}.{function_name}: {e}")
-        
+        for name, config in schema_configs.items():
+            assert config is not None, f"Failed to create config for {name}"
 
 
 class TestModuleIntegration:
@@ -264,15 +182,12 @@ class TestModuleIntegration:
     def test_all_imports(self):
         """Test that all modules can be imported"""
         import url2md
-        import url2md.main
-        import url2md.urlinfo
-        import url2md.cache
-        import url2md.fetch
-        import url2md.summarize
-        import url2md.classify
-        import url2md.report
-        import url2md.utils
-        import url2md.download
+        
+        # Locate submodules without executing them; the command modules
+        # are actually imported by test_command_module_integration
+        for name in ('main', 'urlinfo', 'cache', 'fetch', 'summarize',
+                     'classify', 'report', 'utils', 'download'):
+            assert importlib.util.find_spec(f'url2md.{name}') is not None, f"Missing module: url2md.{name}"
         
         # Test main exports
         assert hasattr(url2md, 'URLInfo')
@@ -304,9 +219,8 @@ class TestModuleIntegration:
         assert callable(extract_html_title)
         
         # Quick functionality test
-        html = '<html><head><title>Test</title></head><body><p>Content</p></body></html>'
-        title = extract_html_title(html)
-        body = extract_body_content(html)
+        title = extract_html_title(SAMPLE_HTML)
+        body = extract_body_content(SAMPLE_HTML)
         
         assert title == 'Test'
         assert '<p>Content</p>' in body
@@ -320,9 +234,15 @@ class TestModuleIntegration:
         assert isinstance(PLAYWRIGHT_AVAILABLE, bool)
         assert callable(is_text)
         assert isinstance(user_agent, str)
-        
-        # Test is_text function
-        assert is_text('text/html') is True
-        assert is_text('application/json') is True
-        assert is_text('image/png') is False
-        assert is_text('') is False
+    
+    @pytest.mark.parametrize("content_type,expected", [
+        ('text/html', True),
+        ('application/json', True),
+        ('image/png', False),
+        ('', False),
+    ])
+    def test_is_text(self, content_type, expected):
+        """Test is_text content type detection"""
+        from url2md.download import is_text
+        
+        assert is_text(content_type) is expected
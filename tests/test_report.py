@@ -5,80 +5,69 @@ Unit tests for report.py module
 
 import tempfile
 from pathlib import Path
+from types import MappingProxyType
 
 import pytest
 from url2md.report import calculate_tag_match_weight, classify_url_to_theme, generate_markdown_report, group_urls_by_tag_in_theme
 from url2md.cache import Cache
 
 
+# Read-only theme data shared by TestClassifyUrlToTheme
+THEMES = (
+    MappingProxyType({
+        "name": "Linguistics",
+        "tags": ("linguistics", "phonology", "morphology", "syntax")
+    }),
+    MappingProxyType({
+        "name": "Mathematics",
+        "tags": ("mathematics", "statistics", "probability", "linear_algebra")
+    }),
+    MappingProxyType({
+        "name": "Programming",
+        "tags": ("Python", "programming", "algorithm")
+    }),
+)
+
+THEME_WEIGHTS = MappingProxyType({
+    "Linguistics": 1.0,
+    "Mathematics": 1.2,  # Higher weight
+    "Programming": 1.0
+})
+
+
 class TestCalculateTagMatchWeight:
     """Tests for tag matching weight calculation"""
     
-    def test_exact_match(self):
-        """Test exact match cases"""
-        assert calculate_tag_match_weight("linguistics", "linguistics") == 1.0
-        assert calculate_tag_match_weight("Python", "Python") == 1.0
-    
-    def test_partial_match_url_in_theme(self):
-        """Test when URL tag is contained in theme tag"""
-        # "math" in "applied_math" = 4/12 ≈ 0.333
-        result = calculate_tag_match_weight("math", "applied_math")
-        assert abs(result - 0.333) < 0.01
-        
-        # "learn" in "machine_learning" = 5/16 = 0.3125
-        result = calculate_tag_match_weight("learn", "machine_learning")
-        assert abs(result - 0.3125) < 0.01
-    
-    def test_partial_match_theme_in_url(self):
-        """Test when theme tag is contained in URL tag"""
-        # "applied_math" contains "math" = 4/12 ≈ 0.333
-        result = calculate_tag_match_weight("applied_math", "math")
-        assert abs(result - 0.333) < 0.01
-        
-        # "machine_learning_algorithm" contains "machine_learning" = 16/26 ≈ 0.615
-        result = calculate_tag_match_weight("machine_learning_algorithm", "machine_learning")
-        assert abs(result - 0.615) < 0.01
-    
-    def test_no_match(self):
-        """Test no match cases"""
-        assert calculate_tag_match_weight("linguistics", "mathematics") == 0.0
-        assert calculate_tag_match_weight("Python", "Java") == 0.0
-        assert calculate_tag_match_weight("", "linguistics") == 0.0
-        assert calculate_tag_match_weight("linguistics", "") == 0.0
+    @pytest.mark.parametrize("url_tag,theme_tag,expected", [
+        # Exact match
+        ("linguistics", "linguistics", 1.0),
+        ("Python", "Python", 1.0),
+        # URL tag contained in theme tag: "math" in "applied_math" = 4/12
+        ("math", "applied_math", 4 / 12),
+        ("learn", "machine_learning", 5 / 16),
+        # Theme tag contained in URL tag
+        ("applied_math", "math", 4 / 12),
+        ("machine_learning_algorithm", "machine_learning", 16 / 26),
+        # No match
+        ("linguistics", "mathematics", 0.0),
+        ("Python", "Java", 0.0),
+        ("", "linguistics", 0.0),
+        ("linguistics", "", 0.0),
+    ])
+    def test_weight(self, url_tag, theme_tag, expected):
+        """Test exact, partial and missing matches"""
+        assert calculate_tag_match_weight(url_tag, theme_tag) == pytest.approx(expected, abs=0.01)
 
 
 class TestClassifyUrlToTheme:
     """Tests for URL classification to themes"""
     
-    def setup_method(self):
-        """Set up test data"""
-        self.themes = [
-            {
-                "name": "Linguistics",
-                "tags": ["linguistics", "phonology", "morphology", "syntax"]
-            },
-            {
-                "name": "Mathematics", 
-                "tags": ["mathematics", "statistics", "probability", "linear_algebra"]
-            },
-            {
-                "name": "Programming",
-                "tags": ["Python", "programming", "algorithm"]
-            }
-        ]
-        
-        self.theme_weights = {
-            "Linguistics": 1.0,
-            "Mathematics": 1.2,  # Higher weight
-            "Programming": 1.0
-        }
-    
     def test_perfect_match(self):
         """Test perfect match cases"""
         url_summary = {
             "tags": ["linguistics", "phonology"]
         }
-        theme, score = classify_url_to_theme(url_summary, self.themes)
+        theme, score = classify_url_to_theme(url_summary, THEMES)
         assert theme == "Linguistics"
         assert score == 2.0  # Two exact matches
     
@@ -87,18 +76,56 @@ class TestClassifyUrlToTheme:
         url_summary = {
             "tags": ["applied_linguistics", "mathematics"]
         }
-        theme, score = classify_url_to_theme(url_summary, self.themes)
+        theme, score = classify_url_to_theme(url_summary, THEMES)
         # "applied_linguistics" vs "linguistics" gives partial score
         # "mathematics" vs "mathematics" = 1.0
         # With weight: Mathematics score = 1.0 * 1.2 = 1.2
         assert theme == "Mathematics"
     
+    def test_theme_tags_inside_url_tag(self):
+        """Test that every theme tag contained in a URL tag contributes"""
+        url_summary = {
+            "tags": ["morphology_syntax"]
+        }
+        theme, score = classify_url_to_theme(url_summary, THEMES)
+        # "morphology" (10/17) + "syntax" (6/17)
+        assert theme == "Linguistics"
+        assert score == pytest.approx(16 / 17)
+    
+    def test_exact_match_with_containing_tags(self):
+        """Test that an exact match still adds partial matches from longer tags"""
+        themes = [{"name": "Mathematics", "tags": ["math", "applied_math"]}]
+        theme, score = classify_url_to_theme({"tags": ["math"]}, themes)
+        # "math" (1.0) + "applied_math" (4/12)
+        assert theme == "Mathematics"
+        assert score == pytest.approx(1.0 + 4 / 12)
+    
+    def test_later_theme_can_exceed_tag_count(self):
+        """Test that a theme scoring one point per URL tag can still be beaten"""
+        themes = [
+            {"name": "Math", "tags": ["math"]},
+            {"name": "Mathematics", "tags": ["math", "applied_math"]},
+        ]
+        theme, score = classify_url_to_theme({"tags": ["math"]}, themes)
+        assert theme == "Mathematics"
+        assert score == pytest.approx(1.0 + 4 / 12)
+    
+    def test_tie_keeps_first_theme(self):
+        """Test that the first of equally scored themes wins"""
+        themes = [
+            {"name": "First", "tags": ["math"]},
+            {"name": "Second", "tags": ["math"]},
+        ]
+        theme, score = classify_url_to_theme({"tags": ["math"]}, themes, {"Second": 1.0})
+        assert theme == "First"
+        assert score == 1.0
+    
     def test_theme_weights(self):
         """Test theme weight application"""
         url_summary = {
             "tags": ["math"]  # Partial match with "mathematics"
         }
-        theme, score = classify_url_to_theme(url_summary, self.themes, self.theme_weights)
+        theme, score = classify_url_to_theme(url_summary, THEMES, THEME_WEIGHTS)
         # Should prefer Mathematics due to higher weight
         assert theme == "Mathematics"
     
@@ -107,7 +134,7 @@ class TestClassifyUrlToTheme:
         url_summary = {
             "tags": ["cooking", "travel"]
         }
-        theme, score = classify_url_to_theme(url_summary, self.themes)
+        theme, score = classify_url_to_theme(url_summary, THEMES)
         assert theme is None
         assert score == 0.0
     
@@ -116,14 +143,14 @@ class TestClassifyUrlToTheme:
         url_summary = {
             "tags": []
         }
-        theme, score = classify_url_to_theme(url_summary, self.themes)
+        theme, score = classify_url_to_theme(url_summary, THEMES)
         assert theme is None
         assert score == 0.0
     
     def test_missing_tags(self):
         """Test missing tags field"""
         url_summary = {}
-        theme, score = classify_url_to_theme(url_summary, self.themes)
+        theme, score = classify_url_to_theme(url_summary, THEMES)
         assert theme is None
         assert score == 0.0
 
@@ -265,15 +292,19 @@ class TestGenerateMarkdownReport:
             report = generate_markdown_report(cache, url_classifications, classification_data, url_summaries)
         
         # Check basic structure
-        assert "# Summary" in report
-        assert "# Themes" in report
-        assert "**Total URLs**: 2" in report
-        assert "**Classified**: 2" in report
-        assert "**Unclassified**: 0" in report
-        assert "## Linguistics (1 URLs)" in report
-        assert "## Programming (1 URLs)" in report
-        assert "[Linguistics Introduction](https://example1.com)" in report
-        assert "Basic linguistics concepts" in report
+        expected = [
+            "# Summary",
+            "# Themes",
+            "**Total URLs**: 2",
+            "**Classified**: 2",
+            "**Unclassified**: 0",
+            "## Linguistics (1 URLs)",
+            "## Programming (1 URLs)",
+            "[Linguistics Introduction](https://example1.com)",
+            "Basic linguistics concepts",
+        ]
+        missing = [s for s in expected if s not in report]
+        assert not missing, f"Missing from report: {missing}"
     
     def test_with_unclassified_urls(self):
         """Test report with unclassified URLs"""
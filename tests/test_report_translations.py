@@ -5,15 +5,71 @@ Test report generation with translation functionality
 
 import tempfile
 from pathlib import Path
+from types import MappingProxyType
+
+import pytest
 
 from url2md.report import generate_markdown_report
 from url2md.cache import Cache
 
 
+@pytest.fixture
+def linguistics_classifications():
+    """Single-URL classification result, built fresh for each test"""
+    return {
+        "https://example1.com": {"theme": "Linguistics", "score": 0.8}
+    }
+
+
+@pytest.fixture
+def linguistics_classification_data():
+    """Classification data with one Linguistics theme, built fresh for each test"""
+    return {
+        "themes": [
+            {
+                "theme_name": "Linguistics",
+                "theme_description": "Language studies",
+                "tags": ["linguistics"]
+            }
+        ]
+    }
+
+
+@pytest.fixture
+def linguistics_summaries():
+    """Summary of the single classified URL, built fresh for each test"""
+    return {
+        "https://example1.com": {
+            "title": ["Linguistics Introduction"],
+            "summary_one_line": "Basic linguistics concepts"
+        }
+    }
+
+
+@pytest.fixture(scope="module")
+def japanese_terms():
+    """Japanese translations of every report UI term, shared read-only"""
+    return MappingProxyType({
+        "Summary": "概要",
+        "Themes": "テーマ",
+        "Total URLs": "合計URL数",
+        "Classified": "分類済",
+        "Unclassified": "未分類",
+        "URLs": "URL",
+        "Other": "その他",
+    })
+
+
+def assert_all_in(report, fragments):
+    """Assert that every fragment occurs in report, listing all that are missing"""
+    missing = [fragment for fragment in fragments if fragment not in report]
+    assert not missing, f"Missing from report: {missing}"
+
+
 class TestReportTranslations:
     """Tests for translation functionality in report generation"""
     
-    def test_with_translations(self):
+    def test_with_translations(self, japanese_terms):
         """Test report generation with translations"""
         with tempfile.TemporaryDirectory() as temp_dir:
             cache_dir = Path(temp_dir)
@@ -21,13 +77,8 @@ class TestReportTranslations:
             
             # Setup translation cache
             tc = cache.translation_cache
-            tc.add_translation("Summary", "Japanese", "概要")
-            tc.add_translation("Themes", "Japanese", "テーマ")
-            tc.add_translation("Total URLs", "Japanese", "合計URL数")
-            tc.add_translation("Classified", "Japanese", "分類済")
-            tc.add_translation("Unclassified", "Japanese", "未分類")
-            tc.add_translation("URLs", "Japanese", "URL")
-            tc.add_translation("Other", "Japanese", "その他")
+            for term, translation in japanese_terms.items():
+                tc.add_translation(term, "Japanese", translation)
             
             url_classifications = {
                 "https://example1.com": {"theme": "Linguistics", "score": 0.8},
@@ -64,14 +115,17 @@ class TestReportTranslations:
             report = generate_markdown_report(cache, url_classifications, classification_data, url_summaries)
 
             # Check translated headers
-            assert "# 概要" in report
-            assert "# テーマ" in report
-            assert "合計URL数" in report
-            assert "分類済" in report
-            assert "未分類" in report
-            assert "URL" in report
-
-    def test_with_partial_translations(self):
+            assert_all_in(report, [
+                "# 概要",
+                "# テーマ",
+                "合計URL数",
+                "分類済",
+                "未分類",
+                "URL",
+            ])
+
+    def test_with_partial_translations(self, japanese_terms, linguistics_classifications,
+                                       linguistics_classification_data, linguistics_summaries):
         """Test report generation with partial translations (some terms missing)"""
         with tempfile.TemporaryDirectory() as temp_dir:
             cache_dir = Path(temp_dir)
@@ -79,39 +133,22 @@ class TestReportTranslations:
             
             # Setup partial translation cache (only Summary translated)
             tc = cache.translation_cache
-            tc.add_translation("Summary", "Japanese", "概要")
+            tc.add_translation("Summary", "Japanese", japanese_terms["Summary"])
             # Other terms not translated
             
-            url_classifications = {
-                "https://example1.com": {"theme": "Linguistics", "score": 0.8}
-            }
+            classification_data = {**linguistics_classification_data, "language": "Japanese"}
 
-            classification_data = {
-                "themes": [
-                    {
-                        "theme_name": "Linguistics",
-                        "theme_description": "Language studies",
-                        "tags": ["linguistics"]
-                    }
-                ],
-                "language": "Japanese"
-            }
-
-            url_summaries = {
-                "https://example1.com": {
-                    "title": ["Linguistics Introduction"],
-                    "summary_one_line": "Basic linguistics concepts"
-                }
-            }
-
-            report = generate_markdown_report(cache, url_classifications, classification_data, url_summaries)
+            report = generate_markdown_report(cache, linguistics_classifications, classification_data,
+                                              linguistics_summaries)
 
             # Check mixed translations (translated where available, English fallback)
-            assert "# 概要" in report  # Translated
-            assert "# Themes" in report  # English fallback
-            assert "Total URLs" in report  # English fallback
+            assert_all_in(report, [
+                "# 概要",  # Translated
+                "# Themes",  # English fallback
+                "Total URLs",  # English fallback
+            ])
 
-    def test_with_unclassified_urls_and_translations(self):
+    def test_with_unclassified_urls_and_translations(self, japanese_terms, linguistics_classifications):
         """Test report with unclassified URLs and translations"""
         with tempfile.TemporaryDirectory() as temp_dir:
             cache_dir = Path(temp_dir)
@@ -119,17 +156,9 @@ class TestReportTranslations:
             
             # Setup translation cache
             tc = cache.translation_cache
-            tc.add_translation("Summary", "Japanese", "概要")
-            tc.add_translation("Themes", "Japanese", "テーマ")
-            tc.add_translation("Total URLs", "Japanese", "合計URL数")
-            tc.add_translation("Classified", "Japanese", "分類済")
-            tc.add_translation("Unclassified", "Japanese", "未分類")
-            tc.add_translation("URLs", "Japanese", "URL")
+            for term in ("Summary", "Themes", "Total URLs", "Classified", "Unclassified", "URLs"):
+                tc.add_translation(term, "Japanese", japanese_terms[term])
             
-            url_classifications = {
-                "https://example1.com": {"theme": "Linguistics", "score": 0.8}
-            }
-
             classification_data = {
                 "themes": [
                     {
@@ -152,15 +181,17 @@ class TestReportTranslations:
                 }
             }
 
-            report = generate_markdown_report(cache, url_classifications, classification_data, url_summaries)
+            report = generate_markdown_report(cache, linguistics_classifications, classification_data, url_summaries)
 
             # Check translated headers including unclassified section
-            assert "# 概要" in report
-            assert "# テーマ" in report
-            assert "## 未分類" in report
-            assert "合計URL数" in report
+            assert_all_in(report, [
+                "# 概要",
+                "# テーマ",
+                "## 未分類",
+                "合計URL数",
+            ])
 
-    def test_with_subsections_and_translations(self):
+    def test_with_subsections_and_translations(self, japanese_terms):
         """Test report with theme subsections and translations"""
         with tempfile.TemporaryDirectory() as temp_dir:
             cache_dir = Path(temp_dir)
@@ -168,12 +199,8 @@ class TestReportTranslations:
             
             # Setup translation cache
             tc = cache.translation_cache
-            tc.add_translation("Summary", "Japanese", "概要")
-            tc.add_translation("Themes", "Japanese", "テーマ")
-            tc.add_translation("Total URLs", "Japanese", "合計URL数")
-            tc.add_translation("Classified", "Japanese", "分類済")
-            tc.add_translation("URLs", "Japanese", "URL")
-            tc.add_translation("Other", "Japanese", "その他")
+            for term in ("Summary", "Themes", "Total URLs", "Classified", "URLs", "Other"):
+                tc.add_translation(term, "Japanese", japanese_terms[term])
             
             url_classifications = {
                 "https://example1.com": {"theme": "Programming", "score": 0.9},
@@ -214,42 +241,27 @@ class TestReportTranslations:
                                             theme_subsections=["Programming"])
 
             # Check translated headers and subsections
-            assert "# 概要" in report
-            assert "# テーマ" in report
-            assert "URL" in report
-            assert "### その他" in report  # "Other" subsection translated
+            assert_all_in(report, [
+                "# 概要",
+                "# テーマ",
+                "URL",
+                "### その他",  # "Other" subsection translated
+            ])
 
-    def test_without_translations(self):
+    def test_without_translations(self, linguistics_classifications, linguistics_classification_data,
+                                  linguistics_summaries):
         """Test report generation without translations (English fallback)"""
-        url_classifications = {
-            "https://example1.com": {"theme": "Linguistics", "score": 0.8}
-        }
-
-        classification_data = {
-            "themes": [
-                {
-                    "theme_name": "Linguistics",
-                    "theme_description": "Language studies",
-                    "tags": ["linguistics"]
-                }
-            ]
-        }
-
-        url_summaries = {
-            "https://example1.com": {
-                "title": ["Linguistics Introduction"],
-                "summary_one_line": "Basic linguistics concepts"
-            }
-        }
-
         # No cache provided, should use English
         with tempfile.TemporaryDirectory() as temp_dir:
             cache = Cache(Path(temp_dir))
-            report = generate_markdown_report(cache, url_classifications, classification_data, url_summaries)
+            report = generate_markdown_report(cache, linguistics_classifications, linguistics_classification_data,
+                                              linguistics_summaries)
 
         # Check English headers (no translations available)
-        assert "# Summary" in report
-        assert "# Themes" in report
-        assert "Total URLs" in report
-        assert "Classified" in report
-        assert "Unclassified" in report
\ No newline at end of file
+        assert_all_in(report, [
+            "# Summary",
+            "# Themes",
+            "Total URLs",
+            "Classified",
+            "Unclassified",
+        ])
\ No newline at end of file
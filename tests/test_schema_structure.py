@@ -6,145 +6,113 @@ Usage:
     uv run pytest tests/test_schema_structure.py
 """
 
+import importlib
 import json
-import re
+import os
 from pathlib import Path
 import pytest
 
 
-def test_schema_modules():
+# Top-level fields of each schema (all of them are required)
+SUMMARIZE_FIELDS = frozenset({'title', 'summary_one_line', 'summary_detailed', 'tags', 'is_valid_content'})
+CLASSIFY_FIELDS = frozenset({'themes', 'classification_summary'})
+TRANSLATE_FIELDS = frozenset({'translations'})
+
+# Public definitions each module must keep (class/def prefixes, checked as substrings)
+API_DEFINITIONS = {
+    'url2md/urlinfo.py': (
+        'class URLInfo',
+        'def load_urls_from_file(',
+    ),
+    'url2md/cache.py': (
+        'class Cache',
+        'class CacheResult',
+        'def get_content_path(',
+        'def get_summary_path(',
+        'def fetch_and_cache_url(',
+        'def load(',
+        'def save(',
+    ),
+}
+
+# Core function of each command module (CLI handling stays in main.py)
+COMMAND_FUNCTIONS = {
+    'url2md/fetch.py': 'fetch_urls',
+    'url2md/summarize.py': 'summarize_urls',
+    'url2md/classify.py': 'extract_tags',
+    'url2md/report.py': 'generate_markdown_report',
+}
+
+
+@pytest.mark.parametrize("module_name,function_name,required,properties", [
+    ('schema', 'create_summarize_schema_class', SUMMARIZE_FIELDS, SUMMARIZE_FIELDS),
+    ('schema', 'create_classify_schema_class', CLASSIFY_FIELDS, CLASSIFY_FIELDS),
+    ('schema', 'create_translate_schema_class', TRANSLATE_FIELDS, TRANSLATE_FIELDS),
+])
+def test_schema_modules(module_name, function_name, required, properties):
     """Test schema module structure"""
-    schema_modules = [
-        ('schema', 'create_summarize_schema_class', {
-            'required': ['title', 'summary_one_line', 'summary_detailed', 'tags', 'is_valid_content'],
-            'properties': ['title', 'summary_one_line', 'summary_detailed', 'tags', 'is_valid_content']
-        }),
-        ('schema', 'create_classify_schema_class', {
-            'required': ['themes', 'classification_summary'],
-            'properties': ['themes', 'classification_summary']
-        }),
-        ('schema', 'create_translate_schema_class', {
-            'required': ['translations'],
-            'properties': ['translations']
-        }),
-    ]
-    
-    for module_name, function_name, expected in schema_modules:
-        try:
-            module = __import__(f'url2md.{module_name}', fromlist=[function_name])
-            schema_func = getattr(module, function_name)
-            
-            # Test schema creation
-            if function_name == 'create_translate_schema_class':
-                # translate_schema requires terms and language parameters
-                schema_class = schema_func(['test', 'example'], 'English')
-                schema = schema_class.model_json_schema()
-            else:
-                schema_class = schema_func()
-                schema = schema_class.model_json_schema()
-            
-            required_fields = schema.get('required', [])
-            properties = list(schema.get('properties', {}).keys())
-            
-            # Check required fields
-            assert set(required_fields) == set(expected['required']), f"Required fields mismatch in {module_name}"
-                
-            # Check properties
-            assert set(properties) == set(expected['properties']), f"Properties mismatch in {module_name}"
-            
-            # Test language parameter (only for non-translate schemas)
-            if function_name != 'create_translate_schema_class':
-                schema_class_lang = schema_func(language='English')
-                schema_lang = schema_class_lang.model_json_schema()
-                assert schema_lang is not None
+    try:
+        module = importlib.import_module(f'url2md.{module_name}')
+        schema_func = getattr(module, function_name)
+        
+        # Test schema creation
+        if function_name == 'create_translate_schema_class':
+            # translate_schema requires terms and language parameters
+            schema_class = schema_func(['test', 'example'], 'English')
+            schema = schema_class.model_json_schema()
+        else:
+            schema_class = schema_func()
+            schema = schema_class.model_json_schema()
+        
+        # Check required fields
+        assert frozenset(schema.get('required', [])) == required, f"Required fields mismatch in {module_name}"
             
-        except ImportError:
-            pytest.fail(f"Cannot import {module_name}.{function_name}")
-        except Exception as e:
-            pytest.fail(f"Error testing {module_name}: {e}")
-
+        # Check properties
+        assert frozenset(schema.get('properties', {})) == properties, f"Properties mismatch in {module_name}"
+        
+        # Test language parameter (only for non-translate schemas)
+        if function_name != 'create_translate_schema_class':
+            schema_class_lang = schema_func(language='English')
+            schema_lang = schema_class_lang.model_json_schema()
+            assert schema_lang is not None
+        
+    except ImportError:
+        pytest.fail(f"Cannot import {module_name}.{function_name}")
+    except Exception as e:
+        pytest.fail(f"Error testing {module_name}: {e}")
 
 
-def test_models_api():
-    """Test urlinfo.py API structure"""
-    with open('url2md/urlinfo.py', 'r', encoding='utf-8') as f:
-        code = f.read()
-    
-    # Check classes
-    api_classes = [
-        'URLInfo'
-    ]
-    
-    for cls in api_classes:
-        assert f'class {cls}' in code, f"Missing API class: {cls}"
-    
-    # Check functions
-    api_functions = [
-        'load_urls_from_file'
-    ]
+def test_schema_classes_cached_per_language():
+    """Test summarize/classify schema classes are built once per language"""
+    from url2md.schema import create_summarize_schema_class, create_classify_schema_class
     
-    for func in api_functions:
-        assert f'def {func}(' in code, f"Missing API function: {func}"
+    for schema_func in (create_summarize_schema_class, create_classify_schema_class):
+        assert schema_func() is schema_func()
+        assert schema_func('English') is schema_func('English')
+        assert schema_func('English') is not schema_func()
 
 
-def test_cache_api():
-    """Test cache.py API structure"""
-    with open('url2md/cache.py', 'r', encoding='utf-8') as f:
-        code = f.read()
-    
-    # Check classes
-    api_classes = [
-        'Cache',
-        'CacheResult'
-    ]
-    
-    for cls in api_classes:
-        assert f'class {cls}' in code, f"Missing API class: {cls}"
-    
-    # Check Cache class methods
-    cache_methods = [
-        'get_content_path',
-        'get_summary_path',
-        'fetch_and_cache_url',
-        'load',
-        'save'
-    ]
-    
-    for method in cache_methods:
-        assert f'def {method}(' in code, f"Missing Cache method: {method}"
+@pytest.mark.parametrize("module_path,definitions", API_DEFINITIONS.items())
+def test_api_structure(module_path, definitions):
+    """Test module API structure (urlinfo.py, cache.py)"""
+    code = Path(module_path).read_text(encoding='utf-8')
+    missing = [definition for definition in definitions if definition not in code]
+    assert not missing, f"Missing API definitions in {module_path}: {missing}"
 
 
-def test_command_modules():
+@pytest.mark.parametrize("module_path,core_function", COMMAND_FUNCTIONS.items())
+def test_command_modules(module_path, core_function):
     """Test command module structure"""
-    command_modules = [
-        'url2md/fetch.py',
-        'url2md/summarize.py', 
-        'url2md/classify.py',
-        'url2md/report.py'
-    ]
+    assert Path(module_path).exists(), f"Missing command module: {module_path}"
     
-    for module_path in command_modules:
-        module_file = Path(module_path)
-        assert module_file.exists(), f"Missing command module: {module_path}"
-        
-        with open(module_file, 'r', encoding='utf-8') as f:
-            code = f.read()
-        
-        # Each command module should have core functions (centralized architecture)
-        if 'fetch.py' in module_path:
-            assert 'def fetch_urls(' in code, f"Missing fetch_urls function in {module_path}"
-        elif 'summarize.py' in module_path:
-            assert 'def summarize_urls(' in code, f"Missing summarize_urls function in {module_path}"
-        elif 'classify.py' in module_path:
-            assert 'def extract_tags(' in code, f"Missing extract_tags function in {module_path}"
-        elif 'report.py' in module_path:
-            assert 'def generate_markdown_report(' in code, f"Missing generate_markdown_report function in {module_path}"
+    # Each command module should have core functions (centralized architecture)
+    code = Path(module_path).read_text(encoding='utf-8')
+    assert f'def {core_function}(' in code, f"Missing {core_function} function in {module_path}"
 
 
 def test_main_entry_point():
     """Test main.py entry point structure"""
-    with open('url2md/main.py', 'r', encoding='utf-8') as f:
-        code = f.read()
+    code = Path('url2md/main.py').read_text(encoding='utf-8')
     
     # Check subcommand handlers
     required_handlers = [
@@ -180,19 +148,36 @@ def test_package_structure():
         'CLAUDE.md'
     ]
     
+    # One directory listing per directory instead of a stat per file
+    listings = {}
+    missing = []
     for file_path in required_files:
-        assert Path(file_path).exists(), f"Missing required file: {file_path}"
-
-
+        directory, _, name = file_path.rpartition('/')
+        if directory not in listings:
+            listings[directory] = {entry.name for entry in os.scandir(directory or '.')}
+        if name not in listings[directory]:
+            missing.append(file_path)
+    
+    assert not missing, f"Missing required files: {missing}"
 
 
 def test_pyproject_configuration():
     """Test pyproject.toml configuration"""
-    with open('pyproject.toml', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = Path('pyproject.toml').read_text(encoding='utf-8')
+    try:
+        # tomllib is in the standard library from Python 3.11
+        import tomllib
+    except ImportError:
+        # Python 3.10: check the raw text instead
+        assert 'name = "url2md"' in content, "Package name not configured"
+        assert 'CC0-1.0' in content, "License not configured correctly"
+        assert 'url2md = "url2md.main:main"' in content, "Entry point not configured"
+        assert 'google-genai' in content, "Gemini dependency missing"
+        return
+    project = tomllib.loads(content)['project']
     
     # Check key configurations
-    assert 'name = "url2md"' in content, "Package name not configured"
-    assert 'CC0-1.0' in content, "License not configured correctly"
-    assert 'url2md = "url2md.main:main"' in content, "Entry point not configured"
-    assert 'google-genai' in content, "Gemini dependency missing"
+    assert project['name'] == 'url2md', "Package name not configured"
+    assert project['license'] == {'text': 'CC0-1.0'}, "License not configured correctly"
+    assert project['scripts']['url2md'] == 'url2md.main:main', "Entry point not configured"
+    assert any(dep.startswith('google-genai') for dep in project['dependencies']), "Gemini dependency missing"
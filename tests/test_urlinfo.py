@@ -3,12 +3,35 @@
 Tests for urlinfo.py module
 """
 
-import tempfile
-from pathlib import Path
+import io
+import sys
 import pytest
-from unittest.mock import patch, mock_open
+from unittest.mock import ANY, MagicMock, patch
 
-from url2md.urlinfo import URLInfo, load_urls_from_file
+from url2md.urlinfo import URLInfo, _extract_domain, _load_urls_from_stream, load_urls_from_file
+
+
+@pytest.fixture
+def mock_response():
+    """Successful streamed requests.Response mock, built fresh for each test"""
+    response = MagicMock(headers={})
+    response.__enter__.return_value = response
+    response.raise_for_status.return_value = None
+    response.iter_content.return_value = []
+    return response
+
+
+@pytest.fixture
+def url_info():
+    """URLInfo for https://example.com/test, built fresh for each test"""
+    return URLInfo(
+        url='https://example.com/test',
+        filename='test.html',
+        fetch_date='2023-01-01T00:00:00',
+        status='success',
+        content_type='text/html',
+        size=1024
+    )
 
 
 class TestURLInfo:
@@ -30,17 +53,9 @@ class TestURLInfo:
         assert url_info.domain == 'example.com', f"Domain mismatch: {url_info.domain}"
         assert len(url_info.hash) == 32, "Hash should be MD5 (32 chars)"
     
-    def test_urlinfo_tsv_serialization(self):
+    def test_urlinfo_tsv_serialization(self, url_info):
         """Test TSV serialization/deserialization"""
-        url_info = URLInfo(
-            url='https://example.com/test',
-            filename='test.html',
-            fetch_date='2023-01-01T00:00:00',
-            status='success',
-            content_type='text/html',
-            size=1024,
-            error='test error'
-        )
+        url_info.error = 'test error'
         
         # Test serialization
         tsv_line = url_info.to_tsv_line()
@@ -57,6 +72,11 @@ class TestURLInfo:
         assert reconstructed.content_type == url_info.content_type
         assert reconstructed.size == url_info.size
         assert reconstructed.error == url_info.error
+        
+        # Row round-trip matches the line round-trip
+        row = url_info.to_tsv_row()
+        assert '\t'.join(row) == tsv_line
+        assert URLInfo.from_tsv_row(row) == reconstructed
     
     def test_urlinfo_error_escaping(self):
         """Test error message escaping in TSV"""
@@ -86,25 +106,15 @@ class TestURLInfo:
         with pytest.raises(ValueError):
             URLInfo.from_tsv_line('')
     
-    def test_urlinfo_domain_extraction(self):
+    @pytest.mark.parametrize("url,expected_domain", [
+        ('https://example.com/path', 'example.com'),
+        ('http://subdomain.example.org', 'subdomain.example.org'),
+        ('https://Example.COM/path', 'example.com'),  # Should be lowercase
+        ('invalid-url', ''),  # Invalid URL should result in empty domain
+    ])
+    def test_urlinfo_domain_extraction(self, url, expected_domain):
         """Test domain extraction from various URLs"""
-        test_cases = [
-            ('https://example.com/path', 'example.com'),
-            ('http://subdomain.example.org', 'subdomain.example.org'),
-            ('https://Example.COM/path', 'example.com'),  # Should be lowercase
-            ('invalid-url', ''),  # Invalid URL should result in empty domain
-        ]
-        
-        for url, expected_domain in test_cases:
-            url_info = URLInfo(
-                url=url,
-                filename='test.html',
-                fetch_date='2023-01-01T00:00:00',
-                status='success',
-                content_type='text/html',
-                size=1024
-            )
-            assert url_info.domain == expected_domain, f"Domain mismatch for {url}"
+        assert _extract_domain(url) == expected_domain, f"Domain mismatch for {url}"
     
     def test_urlinfo_domain_extraction_error_handling(self):
         """Test domain extraction error handling"""
@@ -154,58 +164,40 @@ class TestURLInfo:
         assert url_info.domain == ""
     
     @patch('requests.get')
-    def test_fetch_content_requests(self, mock_get):
-        """Test fetch_content using requests"""
-        # Mock successful response
-        mock_response = mock_get.return_value
-        mock_response.content = b'test content'
-        mock_response.headers = {'content-type': 'text/html; charset=utf-8'}
-        mock_response.raise_for_status.return_value = None
-        
-        url_info = URLInfo(
-            url='https://example.com/test',
-            filename='test.html',
-            fetch_date='2023-01-01T00:00:00',
-            status='success',
-            content_type='text/html',
-            size=1024
-        )
+    def test_fetch_content_requests(self, mock_get, mock_response, url_info, tmp_path):
+        """Test fetch_content_to using requests"""
+        # Mock successful response delivered in two chunks
+        mock_response.iter_content.return_value = [b'test ', b'content']
+        mock_response.headers['content-type'] = 'text/html; charset=utf-8'
+        mock_get.return_value = mock_response
         
-        content = url_info.fetch_content(use_playwright=False)
-        assert content == b'test content'
+        output_path = tmp_path / 'content.html'
+        size = url_info.fetch_content_to(lambda: open(output_path, 'wb'), use_playwright=False)
+        assert size == len(b'test content')
+        assert output_path.read_bytes() == b'test content'
         assert url_info.content_type == 'text/html'
         
         # Verify requests was called with correct parameters
-        mock_get.assert_called_once()
-        args, kwargs = mock_get.call_args
-        assert args[0] == url_info.url
-        assert 'User-Agent' in kwargs['headers']
+        mock_get.assert_called_once_with(url_info.url, headers={'User-Agent': ANY}, timeout=ANY, stream=True)
     
     @patch('requests.get')
-    def test_fetch_content_error_handling(self, mock_get):
-        """Test fetch_content error handling"""
+    def test_fetch_content_error_handling(self, mock_get, url_info):
+        """Test fetch_content_to error handling"""
         # Mock timeout error
         mock_get.side_effect = Exception("Connection timeout")
-        
-        url_info = URLInfo(
-            url='https://example.com/test',
-            filename='test.html',
-            fetch_date='2023-01-01T00:00:00',
-            status='success',
-            content_type='text/html',
-            size=1024
-        )
+        open_output = MagicMock()
         
         with pytest.raises(Exception) as exc_info:
-            url_info.fetch_content(use_playwright=False)
+            url_info.fetch_content_to(open_output, use_playwright=False)
         
         assert "Connection timeout" in str(exc_info.value)
+        open_output.assert_not_called()
 
 
 class TestLoadUrlsFromFile:
     """Tests for load_urls_from_file function"""
     
-    def test_load_urls_from_regular_file(self):
+    def test_load_urls_from_regular_file(self, tmp_path):
         """Test loading URLs from regular file"""
         test_content = """# Comment line
 https://example1.com
@@ -215,28 +207,17 @@ https://example2.com
 https://example3.com
 """
         
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as temp_file:
-            temp_file.write(test_content)
-            temp_file_path = temp_file.name
+        url_file = tmp_path / "urls.txt"
+        url_file.write_text(test_content, encoding='utf-8')
         
-        try:
-            urls = load_urls_from_file(temp_file_path)
-            expected_urls = ['https://example1.com', 'https://example2.com', 'https://example3.com']
-            assert urls == expected_urls
-        finally:
-            Path(temp_file_path).unlink()
+        urls = load_urls_from_file(str(url_file))
+        expected_urls = ['https://example1.com', 'https://example2.com', 'https://example3.com']
+        assert urls == expected_urls
     
     def test_load_urls_empty_file(self):
         """Test loading URLs from empty file"""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as temp_file:
-            temp_file.write('')
-            temp_file_path = temp_file.name
-        
-        try:
-            urls = load_urls_from_file(temp_file_path)
-            assert urls == []
-        finally:
-            Path(temp_file_path).unlink()
+        urls = _load_urls_from_stream(io.StringIO(''))
+        assert urls == []
     
     def test_load_urls_comments_only(self):
         """Test loading URLs from file with only comments"""
@@ -245,25 +226,17 @@ https://example3.com
 # Comment 3
 """
         
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as temp_file:
-            temp_file.write(test_content)
-            temp_file_path = temp_file.name
-        
-        try:
-            urls = load_urls_from_file(temp_file_path)
-            assert urls == []
-        finally:
-            Path(temp_file_path).unlink()
+        urls = _load_urls_from_stream(io.StringIO(test_content))
+        assert urls == []
     
-    @patch('sys.stdin')
-    def test_load_urls_from_stdin(self, mock_stdin):
+    def test_load_urls_from_stdin(self, monkeypatch):
         """Test loading URLs from stdin"""
-        mock_stdin.__iter__.return_value = [
-            '# Comment\n',
-            'https://example1.com\n',
-            '\n',  # Empty line
+        monkeypatch.setattr(sys, 'stdin', io.StringIO(
+            '# Comment\n'
+            'https://example1.com\n'
+            '\n'  # Empty line
             'https://example2.com\n'
-        ]
+        ))
         
         urls = load_urls_from_file('-')
         expected_urls = ['https://example1.com', 'https://example2.com']
@@ -283,13 +256,24 @@ https://example3.com
 https://example3.com
 """
         
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as temp_file:
-            temp_file.write(test_content)
-            temp_file_path = temp_file.name
-        
-        try:
-            urls = load_urls_from_file(temp_file_path)
-            expected_urls = ['https://example1.com', 'https://example2.com', 'https://example3.com']
-            assert urls == expected_urls
-        finally:
-            Path(temp_file_path).unlink()
\ No newline at end of file
+        urls = _load_urls_from_stream(io.StringIO(test_content))
+        expected_urls = ['https://example1.com', 'https://example2.com', 'https://example3.com']
+        assert urls == expected_urls
+
+
+def test_urlinfo_uses_slots():
+    """Test that URLInfo instances have no per-instance __dict__ but stay mutable"""
+    url_info = URLInfo(
+        url='https://example.com/test',
+        filename='',
+        fetch_date='',
+        status='',
+        content_type='',
+        size=0
+    )
+    assert not hasattr(url_info, '__dict__')
+    
+    url_info.status = 'success'
+    assert url_info.status == 'success'
+    with pytest.raises(AttributeError):
+        url_info.unknown_field = 'value'
@@ -5,17 +5,16 @@ Generate Markdown reports from URLs through AI-powered content analysis,
 summarization, and classification.
 """
 
+import importlib
 from importlib.metadata import version
 
 __version__ = version("url2md")
 __author__ = "url2md contributors"
 __license__ = "CC0-1.0"
 
-from .utils import (
-    extract_body_content,
-    extract_html_title,
-)
-
+# The download helpers stay eager: the download submodule shares its name
+# with the download() function, and an eager import keeps the attribute
+# bound to the function. The module itself is cheap to import.
 from .download import (
     PLAYWRIGHT_AVAILABLE,
     download,
@@ -23,15 +22,30 @@ from .download import (
     user_agent,
 )
 
-from .urlinfo import (
-    URLInfo,
-    load_urls_from_file,
-)
+# Public name -> submodule, imported on first attribute access (PEP 562) so
+# that importing any url2md submodule does not pull in requests and friends
+_LAZY_IMPORTS = {
+    "extract_body_content": "utils",
+    "extract_html_title": "utils",
+    "URLInfo": "urlinfo",
+    "load_urls_from_file": "urlinfo",
+    "Cache": "cache",
+    "CacheResult": "cache",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
-from .cache import (
-    Cache,
-    CacheResult,
-)
 
 __all__ = [
     # Version info
@@ -6,19 +6,24 @@ Handles URL caching, file storage, and metadata management.
 """
 
 import mimetypes
+import os
 import sys
 import time
 import traceback
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set
 
 from .urlinfo import URLInfo
 from .tsv_manager import TSVManager
 from .translation_cache import TranslationCache
 
 
+# Column layout of cache.tsv
+CACHE_HEADER = ['url', 'hash', 'filename', 'fetch_date', 'status', 'content_type', 'size', 'error']
+
+
 @dataclass
 class CacheResult:
     """Class representing the result of cache operations"""
@@ -34,10 +39,14 @@ class Cache(TSVManager):
         """Initialize cache"""
         self._cache_dir = cache_dir
         self._entries: Dict[str, URLInfo] = {}  # url -> URLInfo
-        self._domain_access_times: Dict[str, datetime] = {}
+        self._pending: Dict[str, URLInfo] = {}  # url -> URLInfo added since last save
+        self._stale_rows = 0  # rows in cache.tsv superseded by later rows
+        self._content_names: Optional[Set[str]] = None  # filenames in content_dir, scanned lazily
+        self._summary_dir: Optional[Path] = None  # summary directory, set once created
+        self._domain_access_times: Dict[str, float] = {}  # domain -> time.monotonic() of last access
         
         # Initialize TSV manager
-        super().__init__(cache_dir / "cache.tsv")
+        super().__init__(cache_dir / "cache.tsv", expected_header=CACHE_HEADER)
         
         # Initialize translation cache
         self.translation_cache = TranslationCache(cache_dir)
@@ -55,18 +64,26 @@ class Cache(TSVManager):
         return self._cache_dir / "content"
     
     def create_summary_directory(self) -> Path:
-        """Create and return summary directory"""
-        summary_dir = self._cache_dir / "summary"
-        summary_dir.mkdir(exist_ok=True)
-        return summary_dir
+        """Create and return summary directory
+        
+        The directory is created on the first call only; reload() resets this.
+        """
+        if self._summary_dir is None:
+            summary_dir = self._cache_dir / "summary"
+            summary_dir.mkdir(exist_ok=True)
+            self._summary_dir = summary_dir
+        return self._summary_dir
     
     def get_summary_path(self, url_info: URLInfo) -> Optional[Path]:
         """Generate summary file path from URLInfo"""
         if not url_info.filename:
             return None
         summary_dir = self.create_summary_directory()
-        # Replace filename extension with .json
-        base_name = Path(url_info.filename).stem
+        # Replace filename extension with .json (same result as Path.stem
+        # for the hash-based names this cache generates)
+        base_name, _, _ = url_info.filename.rpartition('.')
+        if not base_name:
+            base_name = url_info.filename
         return summary_dir / f"{base_name}.json"
     
     def load(self) -> None:
@@ -85,40 +102,90 @@ class Cache(TSVManager):
                     # Pad row to 8 columns if necessary (for missing error field)
                     while len(row) < 8:
                         row.append('')
-                    line = '\t'.join(row)
-                    url_info = URLInfo.from_tsv_line(line)
+                    # Build the entry from the already split fields
+                    url_info = URLInfo.from_tsv_row(row)
+                    url_info.url = sys.intern(url_info.url)
                     self._entries[url_info.url] = url_info
                 except ValueError as e:
                     print("Warning: Failed to parse TSV line", file=sys.stderr)
                     traceback.print_exc()
+        
+        # Duplicate or unparsable rows are dropped on the next compaction
+        self._pending.clear()
+        self._stale_rows = len(self.data) - len(self._entries)
+    
+    def reload(self) -> None:
+        """Discard unsaved changes and re-read cache.tsv in place
+        
+        Also drops the content_dir snapshot so files written by other
+        processes are seen by the next filename probe, and re-checks the
+        summary directory on next use.
+        """
+        self._content_names = None
+        self._summary_dir = None
+        self.load()
     
     def save(self) -> None:
-        """Save data to cache.tsv"""
+        """Save data to cache.tsv
+        
+        Entries added since the last save are appended to the file. The file
+        is rewritten only when it is missing, has an outdated header, or more
+        than half of its rows have been superseded by later ones.
+        """
         try:
-            # Prepare header and data
-            self.header = ['url', 'hash', 'filename', 'fetch_date', 'status', 'content_type', 'size', 'error']
-            self.data = []
-            
-            # Convert URLInfo entries to TSV rows
-            for url_info in self._entries.values():
-                line = url_info.to_tsv_line()
-                self.data.append(line.split('\t'))
-            
-            # Save using parent class
-            super().save()
+            if not self.tsv_path.exists() or self.header != CACHE_HEADER:
+                self.compact()
+            elif self._pending:
+                rows = [url_info.to_tsv_row() for url_info in self._pending.values()]
+                self.append(rows)
+                self._pending.clear()
+                if self._stale_rows > len(self._entries):
+                    self.compact()
             
         except Exception as e:
             print("Error: cache.tsv save error", file=sys.stderr)
             traceback.print_exc()
             sys.exit(1)
     
+    def compact(self) -> None:
+        """Rewrite cache.tsv with exactly one row per entry"""
+        self.header = list(CACHE_HEADER)
+        self.data = [url_info.to_tsv_row() for url_info in self._entries.values()]
+        
+        # Save using parent class
+        super().save()
+        
+        self._pending.clear()
+        self._stale_rows = 0
+    
     def add(self, url_info: URLInfo) -> None:
         """Add new entry"""
-        self._entries[url_info.url] = url_info
+        self.add_many((url_info,))
+    
+    def add_many(self, url_infos: Iterable[URLInfo]) -> None:
+        """Add multiple entries in one call
         
-        # Update domain access time
-        if url_info.domain:
-            self._domain_access_times[url_info.domain] = datetime.now()
+        Args:
+            url_infos: Entries to add; later entries replace earlier ones with the same URL
+        """
+        entries = self._entries
+        pending = self._pending
+        access_times = self._domain_access_times
+        now = time.monotonic()
+        
+        for url_info in url_infos:
+            # Share one string object between the entry and both index keys
+            url = url_info.url = sys.intern(url_info.url)
+            
+            # Replacing a row that is already in cache.tsv leaves a stale row behind
+            if url in entries and url not in pending:
+                self._stale_rows += 1
+            entries[url] = url_info
+            pending[url] = url_info
+            
+            # Update domain access time
+            if url_info.domain:
+                access_times[url_info.domain] = now
     
     def get(self, url: str) -> Optional[URLInfo]:
         """Get URLInfo for URL"""
@@ -132,19 +199,31 @@ class Cache(TSVManager):
         """Get all entries"""
         return list(self._entries.values())
     
+    def __iter__(self) -> Iterator[URLInfo]:
+        """Iterate over entries without copying them into a list"""
+        return iter(self._entries.values())
+    
+    def __len__(self) -> int:
+        """Number of entries"""
+        return len(self._entries)
+    
     def get_content_path(self, url_info: URLInfo) -> Path:
         """Get content file path from URLInfo"""
         return self.content_dir / url_info.filename
     
     def wait_for_domain_throttle(self, domain: str, wait_seconds: int = 5):
-        """Domain-based throttling"""
+        """Domain-based throttling
+        
+        Sleeps only for the remainder of the interval since the last access
+        to the domain; domains not accessed yet are not delayed.
+        """
         last_access = self._domain_access_times.get(domain)
-        if last_access:
-            elapsed = (datetime.now() - last_access).total_seconds()
-            if elapsed < wait_seconds:
-                wait_time = wait_seconds - elapsed
-                print(f"  Domain access control: waiting {wait_time:.1f}s...")
-                time.sleep(wait_time)
+        if last_access is None:
+            return
+        wait_time = last_access + wait_seconds - time.monotonic()
+        if wait_time > 0:
+            print(f"  Domain access control: waiting {wait_time:.1f}s...")
+            time.sleep(wait_time)
     
     def _create_cache_directories(self):
         """Create cache directories"""
@@ -162,19 +241,29 @@ class Cache(TSVManager):
             if ext:
                 extension = ext
         
+        # Probe an in-memory snapshot of content_dir instead of stat-ing each candidate.
+        # fetch is the only writer, so names chosen here are added to the snapshot
+        # and names of files it removes again are dropped by _remove_content_file().
+        if self._content_names is None:
+            with os.scandir(self.content_dir) as entries:
+                self._content_names = {entry.name for entry in entries}
+        
         filename = f"{url_info.hash}{extension}"
-        if not (self.content_dir / filename).exists():
-            url_info.filename = filename
-            return
         
         # Add counter if collision occurs
         counter = 1
-        while True:
+        while filename in self._content_names:
             filename = f"{url_info.hash}-{counter}{extension}"
-            if not (self.content_dir / filename).exists():
-                url_info.filename = filename
-                break
             counter += 1
+        
+        url_info.filename = filename
+        self._content_names.add(filename)
+    
+    def _remove_content_file(self, content_path: Path) -> None:
+        """Delete a content file and free its name in the content_dir snapshot"""
+        content_path.unlink(missing_ok=True)
+        if self._content_names is not None:
+            self._content_names.discard(content_path.name)
     
     def fetch_and_cache_url(self, url: str, use_playwright: bool = False, throttle_seconds: int = 5) -> CacheResult:
         """Fetch URL and cache it
@@ -209,27 +298,34 @@ class Cache(TSVManager):
         if url_info.domain:
             self.wait_for_domain_throttle(url_info.domain, throttle_seconds)
         
-        # Fetch content from URL
-        try:
-            content = url_info.fetch_content(use_playwright=use_playwright)
-            url_info.fetch_date = datetime.now().isoformat()
+        # Content file created by this attempt, removed again if the fetch fails;
+        # the entry then keeps the filename it had before
+        content_path = None
+        previous_filename = url_info.filename
+        
+        def open_content_file():
+            nonlocal content_path
             
             # Clean content type (remove charset part)
             if url_info.content_type and ';' in url_info.content_type:
                 url_info.content_type = url_info.content_type.split(';')[0].strip()
             
-            # Find available filename
-            self.find_available_filename(url_info)
-            
-            # Save content to file
-            content_path = self.get_content_path(url_info)
-            with open(content_path, 'wb') as f:
-                if isinstance(content, str):
-                    f.write(content.encode('utf-8'))
-                else:
-                    f.write(content)
-            
-            url_info.size = len(content)
+            # Find available filename and create it exclusively; a name taken by
+            # another process since the content_dir snapshot is skipped
+            while True:
+                self.find_available_filename(url_info)
+                path = self.get_content_path(url_info)
+                try:
+                    f = open(path, 'xb')
+                except FileExistsError:
+                    continue
+                content_path = path
+                return f
+        
+        # Fetch content from URL, streaming it into the content file
+        try:
+            url_info.size = url_info.fetch_content_to(open_content_file, use_playwright=use_playwright)
+            url_info.fetch_date = datetime.now().isoformat()
             url_info.status = 'success'
             
             # Add to cache and save
@@ -247,6 +343,11 @@ class Cache(TSVManager):
             )
             
         except Exception as e:
+            # Do not leave a partially written file behind
+            if content_path:
+                self._remove_content_file(content_path)
+                url_info.filename = previous_filename
+            
             # Handle error
             error_msg = str(e)
             # Remove " at http" part (Playwright error message format)
@@ -17,10 +17,7 @@ from llm7shi import generate_content_retry, config_from_schema, build_schema_fro
 from .translate import translate_terms
 from .urlinfo import URLInfo
 from .schema import create_classify_schema_class
-
-
-# Global list of terms that need translation
-TRANSLATION_TERMS = ['Summary', 'Themes', 'Total URLs', 'Classified', 'Unclassified', 'URLs', 'Other']
+from .translation_cache import TRANSLATION_TERMS
 
 
 def extract_tags(cache: Cache, url_infos: List[URLInfo]) -> List[str]:
@@ -38,8 +35,9 @@ def extract_tags(cache: Cache, url_infos: List[URLInfo]) -> List[str]:
     for url_info in url_infos:
         # Read JSON using Cache method
         summary_file = cache.get_summary_path(url_info)
-        if summary_file and summary_file.exists():
+        if summary_file:
             try:
+                # Opening directly checks existence without a separate stat
                 with open(summary_file, 'r', encoding='utf-8') as f:
                     summary_data = json.load(f)
                 
@@ -49,6 +47,8 @@ def extract_tags(cache: Cache, url_infos: List[URLInfo]) -> List[str]:
                 elif isinstance(tags, str):
                     tag_list = [tag.strip() for tag in tags.split(',') if tag.strip()]
                     all_tags.extend(tag_list)
+            except FileNotFoundError:
+                continue
             except Exception as e:
                 print(f"Warning: Summary file read error ({url_info.url})", file=sys.stderr)
                 traceback.print_exc()
@@ -250,9 +250,12 @@ def translate_report_terms(language: str, model: str = None, cache: Optional[Cac
     
     # Add to cache if available
     if cache and cache.translation_cache:
-        for term, translation in translations.items():
-            if term in TRANSLATION_TERMS:  # Only cache the predefined terms
-                cache.translation_cache.add_translation(term, language, translation)
+        # Only cache the predefined terms
+        cache.translation_cache.add_translations(
+            (term, language, translation)
+            for term, translation in translations.items()
+            if term in TRANSLATION_TERMS
+        )
         cache.translation_cache.save()
 
 
@@ -261,15 +264,8 @@ def filter_url_infos_by_urls(cache: Cache, target_urls: List[str]) -> List[URLIn
     if not target_urls:
         return cache.get_all()
     
-    # Create lookup set for efficiency
+    # Set lookup keeps this O(N + M) for N cached and M target URLs
     target_set = set(target_urls)
-    
-    # Filter URLInfo objects
-    filtered = []
-    for url_info in cache.get_all():
-        if url_info.url in target_set:
-            filtered.append(url_info)
-    
-    return filtered
+    return [url_info for url_info in cache if url_info.url in target_set]
 
 
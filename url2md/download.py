@@ -9,17 +9,15 @@ Usage:
 """
 
 import argparse
+import importlib.util
 import sys
 
-try:
-    from playwright.sync_api import sync_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+# Only locate Playwright here; it is imported when download() first runs
+PLAYWRIGHT_AVAILABLE = importlib.util.find_spec("playwright") is not None
 
 user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36"
 
-text_types = [
+text_types = frozenset([
     'application/json',
     'application/xml',
     'application/xhtml+xml',
@@ -28,7 +26,7 @@ text_types = [
     'application/x-httpd-php',
     'application/x-sh',
     'application/x-yaml',
-]
+])
 
 
 def is_text(content_type: str) -> bool:
@@ -38,6 +36,7 @@ def is_text(content_type: str) -> bool:
 
 def download(url: str) -> tuple[str, bytes]:
     """Fetch content after dynamic rendering using Playwright"""
+    from playwright.sync_api import sync_playwright
     
     with sync_playwright() as p:
         browser = p.chromium.launch()
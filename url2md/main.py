@@ -554,10 +554,15 @@ def run_workflow(args) -> None:
         print(f"📄 Final report: {args.output}")
 
 
-def main() -> int:
-    """Main entry point"""
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point
+    
+    Args:
+        argv: Command-line arguments without the program name
+              (defaults to sys.argv[1:])
+    """
     parser = create_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
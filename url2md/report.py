@@ -8,11 +8,14 @@ Generate comprehensive reports from classification data in Markdown format.
 import json
 import sys
 import traceback
-from collections import Counter
+from collections import Counter, defaultdict
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from .cache import Cache
+from .translation_cache import TRANSLATION_TERMS
 from .urlinfo import URLInfo
 
 
@@ -42,6 +45,25 @@ def calculate_tag_match_weight(url_tag: str, theme_tag: str) -> float:
     return 0.0
 
 
+@lru_cache(maxsize=256)
+def _theme_tag_text(theme_tags: Tuple[str, ...]) -> str:
+    """Join theme tags with newlines for a single substring pre-check
+    
+    If a URL tag is not a substring of the joined text, no theme tag contains
+    it, so only theme tags contained in the URL tag can match. That check
+    runs inside str.__contains__ instead of one Python call per tag pair.
+    """
+    return '\n'.join(theme_tags)
+
+
+class _TermMap(dict):
+    """Translated UI terms; a missing term falls back to English and is kept"""
+    
+    def __missing__(self, term: str) -> str:
+        self[term] = term
+        return term
+
+
 def load_url_summaries(cache: Cache, url_infos: List[URLInfo]) -> Dict[str, Dict]:
     """Load URL summary data
     
@@ -97,11 +119,20 @@ def classify_url_to_theme(url_summary: Dict, themes: List[Dict], theme_weights:
     for theme_data in themes:
         theme_name = theme_data['name']
         theme_tags = theme_data['tags']
+        theme_text = _theme_tag_text(tuple(theme_tags))
         
         # Calculate theme score
         theme_score = 0.0
         for url_tag in url_tags:
-            for theme_tag in theme_tags:
+            if url_tag in theme_text:
+                # Exact matches do not end the search: longer theme tags
+                # containing url_tag add their partial weights too
+                candidates = [theme_tag for theme_tag in theme_tags
+                              if url_tag in theme_tag or theme_tag in url_tag]
+            else:
+                # No theme tag contains url_tag; only tags inside it can match
+                candidates = [theme_tag for theme_tag in theme_tags if theme_tag in url_tag]
+            for theme_tag in candidates:
                 match_weight = calculate_tag_match_weight(url_tag, theme_tag)
                 if match_weight > 0:
                     theme_score += match_weight
@@ -172,8 +203,9 @@ def group_urls_by_tag_in_theme(urls_with_scores: List[Tuple[str, float]], theme_
     Returns:
         Dict[str, List[Tuple[str, float]]]: tag -> [(url, score), ...] mapping
     """
-    tag_groups = {}
+    tag_groups = defaultdict(list)
     untagged = []
+    theme_text = _theme_tag_text(tuple(theme_tags))
     
     for url, score in urls_with_scores:
         summary = url_summaries.get(url, {})
@@ -182,10 +214,13 @@ def group_urls_by_tag_in_theme(urls_with_scores: List[Tuple[str, float]], theme_
         # Find first matching tag (prioritize URL tag order)
         matched = False
         for url_tag in url_tags:
-            for theme_tag in theme_tags:
+            if url_tag in theme_text:
+                candidates = theme_tags
+            else:
+                # No theme tag contains url_tag; only tags inside it can match
+                candidates = [theme_tag for theme_tag in theme_tags if theme_tag in url_tag]
+            for theme_tag in candidates:
                 if calculate_tag_match_weight(url_tag, theme_tag) > 0:
-                    if theme_tag not in tag_groups:
-                        tag_groups[theme_tag] = []
                     tag_groups[theme_tag].append((url, score))
                     matched = True
                     break
@@ -199,7 +234,33 @@ def group_urls_by_tag_in_theme(urls_with_scores: List[Tuple[str, float]], theme_
     if untagged:
         tag_groups['_untagged'] = untagged
     
-    return tag_groups
+    return dict(tag_groups)
+
+
+def _format_url_entry(url: str, summary: Dict) -> str:
+    """Format the Markdown block for one URL entry
+    
+    Args:
+        url: URL of the entry
+        summary: URL summary data (title falls back to the URL)
+    
+    Returns:
+        str: Entry lines ending with the blank separator line's newline, so
+        one report line per entry joins to the same text
+    """
+    title = summary['title'][0] if summary.get('title') else url
+    one_line = summary.get('summary_one_line', '')
+    
+    if one_line:
+        # Two trailing spaces make a Markdown line break before the summary
+        return f"- [{title}]({url})  \n  {one_line}\n"
+    return f"- [{title}]({url})\n"
+
+
+def _format_url_entries(urls_with_scores: List[Tuple[str, float]], url_summaries: Dict[str, Dict]) -> List[str]:
+    """Format the entries of (url, score) pairs, one report line each"""
+    get_summary = url_summaries.get
+    return [_format_url_entry(url, get_summary(url, {})) for url, _ in urls_with_scores]
 
 
 def generate_markdown_report(cache: Cache, url_classifications: Dict[str, Dict], classification_data: Dict, 
@@ -219,15 +280,12 @@ def generate_markdown_report(cache: Cache, url_classifications: Dict[str, Dict],
     # Get language from classification data
     language = classification_data.get('language')
     
-    # Translation helper function
-    def t(term: str) -> str:
-        # Use cache for translation lookup
-        if cache.translation_cache and language:
-            cached = cache.translation_cache.get_translation(term, language)
-            if cached:
-                return cached
-        # Default to original term
-        return term
+    # Resolve UI terms once; terms without a translation resolve to English
+    # on first lookup, so every later lookup is a plain dict read
+    t = _TermMap()
+    if cache.translation_cache and language:
+        t.update(cache.translation_cache.get_translations(TRANSLATION_TERMS, language))
+    
     # Count classifications by theme
     theme_counts = Counter(classification['theme'] for classification in url_classifications.values())
     total_classified = len(url_classifications)
@@ -236,26 +294,26 @@ def generate_markdown_report(cache: Cache, url_classifications: Dict[str, Dict],
     
     # Generate report
     lines = []
-    lines.append(f"# {t('Summary')}")
+    lines.append(f"# {t['Summary']}")
     lines.append("")
-    lines.append(f"- **{t('Total URLs')}**: {total_urls:,}")
+    lines.append(f"- **{t['Total URLs']}**: {total_urls:,}")
     if total_urls > 0:
-        lines.append(f"- **{t('Classified')}**: {total_classified:,} ({total_classified/total_urls*100:.1f}%)")
-        lines.append(f"- **{t('Unclassified')}**: {unclassified_count:,} ({unclassified_count/total_urls*100:.1f}%)")
+        lines.append(f"- **{t['Classified']}**: {total_classified:,} ({total_classified/total_urls*100:.1f}%)")
+        lines.append(f"- **{t['Unclassified']}**: {unclassified_count:,} ({unclassified_count/total_urls*100:.1f}%)")
     else:
-        lines.append(f"- **{t('Classified')}**: 0 (0.0%)")
-        lines.append(f"- **{t('Unclassified')}**: 0 (0.0%)")
+        lines.append(f"- **{t['Classified']}**: 0 (0.0%)")
+        lines.append(f"- **{t['Unclassified']}**: 0 (0.0%)")
     lines.append("")
     
     # Theme distribution
-    lines.append(f"# {t('Themes')}")
+    lines.append(f"# {t['Themes']}")
     lines.append("")
     
     themes_data = classification_data.get('themes', [])
     # Sort by count descending
     for theme_name, count in theme_counts.most_common():
         percentage = count / total_urls * 100
-        lines.append(f"- **{theme_name}**: {count} {t('URLs')} ({percentage:.1f}%)")
+        lines.append(f"- **{theme_name}**: {count} {t['URLs']} ({percentage:.1f}%)")
     
     lines.append("")
     
@@ -267,18 +325,24 @@ def generate_markdown_report(cache: Cache, url_classifications: Dict[str, Dict],
             urls_by_theme[theme] = []
         urls_by_theme[theme].append((url, classification['score']))
     
-    # Get theme descriptions
+    # Get theme descriptions and tags
     theme_descriptions = {}
+    theme_tags_by_name = {}
     for theme_info in themes_data:
         theme_name = theme_info.get('theme_name', '')
         theme_descriptions[theme_name] = theme_info.get('theme_description', '')
+        # Keep the first theme of a name, as the former linear lookup did
+        theme_tags_by_name.setdefault(theme_name, theme_info.get('tags', []))
+    
+    # Only these themes pay for per-tag grouping
+    theme_subsections_set = frozenset(theme_subsections or ())
     
     # Output each theme (sorted by count descending)
     for theme_name, count in theme_counts.most_common():
         if theme_name not in urls_by_theme:
             continue
         urls_with_scores = urls_by_theme[theme_name]
-        lines.append(f"## {theme_name} ({len(urls_with_scores)} {t('URLs')})")
+        lines.append(f"## {theme_name} ({len(urls_with_scores)} {t['URLs']})")
         lines.append("")
         
         # Add theme description if available
@@ -287,15 +351,10 @@ def generate_markdown_report(cache: Cache, url_classifications: Dict[str, Dict],
             lines.append("")
         
         # Sort by score descending
-        urls_with_scores.sort(key=lambda x: x[1], reverse=True)
+        urls_with_scores.sort(key=itemgetter(1), reverse=True)
         
-        if theme_subsections and theme_name in theme_subsections:
-            # Get theme tags
-            theme_tags = []
-            for theme_info in themes_data:
-                if theme_info.get('theme_name', '') == theme_name:
-                    theme_tags = theme_info.get('tags', [])
-                    break
+        if theme_name in theme_subsections_set:
+            theme_tags = theme_tags_by_name.get(theme_name, [])
             
             # Group URLs by tags
             tag_groups = group_urls_by_tag_in_theme(urls_with_scores, theme_tags, url_summaries)
@@ -306,59 +365,25 @@ def generate_markdown_report(cache: Cache, url_classifications: Dict[str, Dict],
                     tag_urls = tag_groups[theme_tag]
                     lines.append(f"### {theme_tag}")
                     lines.append("")
-                    
-                    for url, score in tag_urls:
-                        summary = url_summaries.get(url, {})
-                        title = summary.get('title', [''])[0] if summary.get('title') else url
-                        one_line = summary.get('summary_one_line', '')
-                        
-                        lines.append(f"- [{title}]({url})" + ("  " if one_line else ""))
-                        if one_line:
-                            lines.append(f"  {one_line}")
-                        lines.append("")
+                    lines.extend(_format_url_entries(tag_urls, url_summaries))
             
             # Output untagged URLs if any
             if '_untagged' in tag_groups:
-                lines.append(f"### {t('Other')}")
+                lines.append(f"### {t['Other']}")
                 lines.append("")
-                
-                for url, score in tag_groups['_untagged']:
-                    summary = url_summaries.get(url, {})
-                    title = summary.get('title', [''])[0] if summary.get('title') else url
-                    one_line = summary.get('summary_one_line', '')
-                    
-                    lines.append(f"- [{title}]({url})" + ("  " if one_line else ""))
-                    if one_line:
-                        lines.append(f"  {one_line}")
-                    lines.append("")
+                lines.extend(_format_url_entries(tag_groups['_untagged'], url_summaries))
         else:
             # Original flat list output
-            for url, score in urls_with_scores:
-                summary = url_summaries.get(url, {})
-                title = summary.get('title', [''])[0] if summary.get('title') else url
-                one_line = summary.get('summary_one_line', '')
-                
-                lines.append(f"- [{title}]({url})" + ("  " if one_line else ""))
-                if one_line:
-                    lines.append(f"  {one_line}")
-                lines.append("")
+            lines.extend(_format_url_entries(urls_with_scores, url_summaries))
     
     # Unclassified URLs
     if unclassified_count > 0:
-        lines.append(f"## {t('Unclassified')} ({unclassified_count} {t('URLs')})")
+        lines.append(f"## {t['Unclassified']} ({unclassified_count} {t['URLs']})")
         lines.append("")
         
-        classified_urls = set(url_classifications.keys())
-        for url in sorted(url_summaries.keys()):
-            if url not in classified_urls:
-                summary = url_summaries[url]
-                title = summary.get('title', [''])[0] if summary.get('title') else url
-                one_line = summary.get('summary_one_line', '')
-                
-                lines.append(f"- [{title}]({url})" + ("  " if one_line else ""))
-                if one_line:
-                    lines.append(f"  {one_line}")
-                lines.append("")
+        # Key-view difference, so only the unclassified URLs are sorted
+        unclassified_urls = sorted(url_summaries.keys() - url_classifications.keys())
+        lines.extend(_format_url_entry(url, url_summaries[url]) for url in unclassified_urls)
     
     return "\n".join(lines)
 
@@ -368,15 +393,8 @@ def filter_url_infos_by_urls(cache: Cache, target_urls: List[str]) -> List[URLIn
     if not target_urls:
         return cache.get_all()
     
-    # Create lookup set for efficiency
+    # Set lookup keeps this O(N + M) for N cached and M target URLs
     target_set = set(target_urls)
-    
-    # Filter URLInfo objects
-    filtered = []
-    for url_info in cache.get_all():
-        if url_info.url in target_set:
-            filtered.append(url_info)
-    
-    return filtered
+    return [url_info for url_info in cache if url_info.url in target_set]
 
 
@@ -6,10 +6,12 @@ operations including summarization, classification, and translation with
 multi-language support.
 """
 
+from functools import lru_cache
 from typing import Optional, List, Type
 from pydantic import BaseModel, Field, create_model
 
 
+@lru_cache(maxsize=None)
 def create_summarize_schema_class(language: Optional[str] = None) -> Type[BaseModel]:
     """
     Create Pydantic schema class for URL content summarization.
@@ -20,6 +22,7 @@ def create_summarize_schema_class(language: Optional[str] = None) -> Type[BaseMo
                  
     Returns:
         Pydantic BaseModel class for summarization output.
+        The class is cached per language; callers must not modify it.
     """
     lang_suffix = f" in {language}" if language else ""
     
@@ -43,6 +46,7 @@ def create_summarize_schema_class(language: Optional[str] = None) -> Type[BaseMo
     return SummarizeResult
 
 
+@lru_cache(maxsize=None)
 def create_classify_schema_class(language: Optional[str] = None) -> Type[BaseModel]:
     """
     Create Pydantic schema class for tag classification.
@@ -53,6 +57,7 @@ def create_classify_schema_class(language: Optional[str] = None) -> Type[BaseMod
                  
     Returns:
         Pydantic BaseModel class for classification output.
+        The class is cached per language; callers must not modify it.
     """
     lang_suffix = f" in {language}" if language else ""
     
@@ -46,8 +46,13 @@ def generate_summary_prompt(url: str, content_type: str, language: str = None) -
     return "\n".join(prompt_parts)
 
 
-def summarize_content(cache: Cache, url_info: URLInfo, model: str, language: str = None) -> Tuple[bool, Dict[str, Any], Optional[str]]:
-    """Generate structured JSON summary for a single file using Gemini"""
+def summarize_content(cache: Cache, url_info: URLInfo, model: str, language: str = None,
+                      config: Any = None) -> Tuple[bool, Dict[str, Any], Optional[str]]:
+    """Generate structured JSON summary for a single file using Gemini
+    
+    config is the generation config from config_from_schema; it is built
+    here when omitted, so batch callers should pass one in.
+    """
     
     url = url_info.url
     content_path = cache.get_content_path(url_info)
@@ -62,8 +67,9 @@ def summarize_content(cache: Cache, url_info: URLInfo, model: str, language: str
     
     try:
         # Build Pydantic schema class
-        schema_class = create_summarize_schema_class(language=language)
-        config = config_from_schema(schema_class)
+        if config is None:
+            schema_class = create_summarize_schema_class(language=language)
+            config = config_from_schema(schema_class)
         
         # Generate prompt
         prompt = generate_summary_prompt(url, content_type, language)
@@ -188,26 +194,15 @@ def filter_url_infos_by_urls(cache: Cache, target_urls: List[str]) -> List[URLIn
     if not target_urls:
         return cache.get_all()
     
-    # Create lookup set for efficiency
+    # Set lookup keeps this O(N + M) for N cached and M target URLs
     target_set = set(target_urls)
-    
-    # Filter URLInfo objects
-    filtered = []
-    for url_info in cache.get_all():
-        if url_info.url in target_set:
-            filtered.append(url_info)
-    
-    return filtered
+    return [url_info for url_info in cache if url_info.url in target_set]
 
 
 def filter_url_infos_by_hash(cache: Cache, target_hash: str) -> List[URLInfo]:
     """Filter URLInfo objects by specific hash"""
-    filtered = []
-    for url_info in cache.get_all():
-        if url_info.hash == target_hash:
-            filtered.append(url_info)
-    
-    return filtered
+    # URLInfo.hash is computed once per entry, so this is one comparison per entry
+    return [url_info for url_info in cache if url_info.hash == target_hash]
 
 
 def summarize_urls(url_infos: List[URLInfo], cache: Cache, force: bool = False, 
@@ -263,6 +258,15 @@ def summarize_urls(url_infos: List[URLInfo], cache: Cache, force: bool = False,
     
     print(f"Summarizing {len(urls_to_summarize)} URLs...")
     
+    # Build the generation config once for the whole batch
+    try:
+        schema_class = create_summarize_schema_class(language=language)
+        config = config_from_schema(schema_class)
+    except Exception as e:
+        print(f"Error: Cannot build schema: {e}", file=sys.stderr)
+        traceback.print_exc()
+        sys.exit(1)
+    
     # Process with progress bar
     success_count = 0
     error_count = 0
@@ -271,15 +275,15 @@ def summarize_urls(url_infos: List[URLInfo], cache: Cache, force: bool = False,
         for url_info in urls_to_summarize:
             pbar.set_description(f"Summarizing: {url_info.url[:50]}...")
             
-            success, summary_data, error = summarize_content(cache, url_info, model=model, language=language)
+            success, summary_data, error = summarize_content(cache, url_info, model=model, language=language, config=config)
             
             if success:
                 # Save summary to JSON file
                 summary_path = cache.get_summary_path(url_info)
                 if summary_path:
                     summary_path.parent.mkdir(exist_ok=True)
-                    with open(summary_path, 'w', encoding='utf-8') as f:
-                        json.dump(summary_data, f, ensure_ascii=False, indent=2)
+                    # Serialize first so a failure cannot leave a truncated file
+                    summary_path.write_text(json.dumps(summary_data, ensure_ascii=False, indent=2), encoding='utf-8')
                     
                     print(f"✅ Summary saved: {summary_path}")
                     success_count += 1
@@ -6,11 +6,18 @@ Handles caching of translated terms to avoid repeated LLM calls.
 """
 
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Tuple
 
 from .tsv_manager import TSVManager
 
 
+# Column layout of terms.tsv
+TERMS_HEADER = ['English', 'Language', 'Translation']
+
+# Report UI terms that are translated and cached
+TRANSLATION_TERMS = ['Summary', 'Themes', 'Total URLs', 'Classified', 'Unclassified', 'URLs', 'Other']
+
+
 class TranslationCache(TSVManager):
     """Translation cache management using TSV format: English\tLanguage\tTranslation"""
     
@@ -21,9 +28,12 @@ class TranslationCache(TSVManager):
             cache_dir: Cache directory containing terms.tsv
         """
         self._translations: Dict[tuple, str] = {}  # (english, language) -> translation
+        self._pending: Dict[tuple, str] = {}  # translations added since last save
+        self._stale_rows = 0  # rows in terms.tsv superseded by later rows
+        self._needs_compact = False  # set by clear(); the next save() rewrites terms.tsv
         
         # Initialize TSV manager
-        super().__init__(cache_dir / "terms.tsv")
+        super().__init__(cache_dir / "terms.tsv", expected_header=TERMS_HEADER)
         
         # Load existing translations
         self.load()
@@ -32,25 +42,44 @@ class TranslationCache(TSVManager):
         """Load translations from TSV file"""
         super().load()
         
-        self._translations.clear()
-        for row in self.data:
-            if len(row) >= 3:
-                english, language, translation = row[0], row[1], row[2]
-                self._translations[(english, language)] = translation
+        # Build the (english, language) index in one pass; later rows win
+        self._translations = {(row[0], row[1]): row[2] for row in self.data if len(row) >= 3}
+        
+        self._pending.clear()
+        self._stale_rows = len(self.data) - len(self._translations)
+        self._needs_compact = False
     
     def save(self) -> None:
-        """Save translations to TSV file"""
-        # Prepare header and data
-        self.header = ['English', 'Language', 'Translation']
-        self.data = []
+        """Save translations to TSV file
+        
+        Translations added since the last save are appended to the file. The
+        file is rewritten only when it is missing, has an unexpected header,
+        has been cleared, or stale rows outnumber live translations.
+        """
+        if self._needs_compact or not self.tsv_path.exists() or self.header != TERMS_HEADER:
+            self.compact()
+            return
         
-        # Convert translations to TSV rows
-        for (english, language), translation in self._translations.items():
-            row = [english, language, translation]
-            self.data.append(row)
+        if self._pending:
+            rows = [[english, language, translation]
+                    for (english, language), translation in self._pending.items()]
+            self.append(rows)
+            self._pending.clear()
         
-        # Save using parent class
+        if self._stale_rows > len(self._translations):
+            self.compact()
+    
+    def compact(self) -> None:
+        """Rewrite terms.tsv with exactly one row per translation"""
+        # Prepare header and rows, then write them with a single join and write
+        self.header = list(TERMS_HEADER)
+        self.data = [[english, language, translation]
+                     for (english, language), translation in self._translations.items()]
         super().save()
+        
+        self._pending.clear()
+        self._stale_rows = 0
+        self._needs_compact = False
     
     def get_translation(self, english: str, language: str) -> Optional[str]:
         """Get cached translation
@@ -64,6 +93,20 @@ class TranslationCache(TSVManager):
         """
         return self._translations.get((english, language))
     
+    def get_translations(self, terms: Iterable[str], language: str) -> Dict[str, str]:
+        """Get cached translations for several terms at once
+        
+        Args:
+            terms: English terms
+            language: Target language
+            
+        Returns:
+            Term -> translation mapping; terms without a cached translation
+            map to themselves
+        """
+        translations = self._translations
+        return {term: translations.get((term, language)) or term for term in terms}
+    
     def add_translation(self, english: str, language: str, translation: str) -> None:
         """Add translation to cache
         
@@ -72,7 +115,28 @@ class TranslationCache(TSVManager):
             language: Target language
             translation: Translated term
         """
-        self._translations[(english, language)] = translation
+        self.add_translations([(english, language, translation)])
+    
+    def add_translations(self, translations: Iterable[Tuple[str, str, str]]) -> None:
+        """Add multiple translations in one call
+        
+        Args:
+            translations: (english, language, translation) tuples; later
+                tuples replace earlier ones for the same term and language
+        """
+        cached = self._translations
+        pending = self._pending
+        
+        for english, language, translation in translations:
+            key = (english, language)
+            if cached.get(key) == translation:
+                continue
+            
+            # Replacing a row that is already in terms.tsv leaves a stale row behind
+            if key in cached and key not in pending:
+                self._stale_rows += 1
+            cached[key] = translation
+            pending[key] = translation
     
     def has_translation(self, english: str, language: str) -> bool:
         """Check if translation exists in cache
@@ -95,5 +159,11 @@ class TranslationCache(TSVManager):
         return self._translations.copy()
     
     def clear(self) -> None:
-        """Clear all translations from memory"""
-        self._translations.clear()
\ No newline at end of file
+        """Clear all translations from memory
+        
+        A subsequent save() rewrites terms.tsv without the cleared rows.
+        """
+        self._translations.clear()
+        self._pending.clear()
+        self._stale_rows = 0
+        self._needs_compact = True
\ No newline at end of file
@@ -5,8 +5,13 @@ TSV file management functionality
 Provides common TSV file operations for cache implementations.
 """
 
+import csv
+import os
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+
+# Read buffer size for loading TSV files
+READ_BUFFER_SIZE = 1 << 20
 
 
 def sanitize_tsv_field(value: str) -> str:
@@ -18,19 +23,41 @@ def sanitize_tsv_field(value: str) -> str:
     Returns:
         str: Sanitized value with tabs and newlines replaced by spaces
     """
+    # Almost every field is clean; skip the replace chain for those
+    if '\t' not in value and '\n' not in value and '\r' not in value:
+        return value
     return value.replace('\r\n', ' ').replace('\r', ' ').replace('\n', ' ').replace('\t', ' ')
 
 
+def encode_tsv_rows(rows: List[List[str]]) -> bytes:
+    """Encode rows as UTF-8 TSV lines
+    
+    Rows are joined and encoded in one pass so that callers can write the
+    result with a single write() call.
+    
+    Args:
+        rows: Rows of already sanitized field values
+        
+    Returns:
+        bytes: Encoded TSV lines, each terminated by a newline
+    """
+    return ''.join('\t'.join(row) + '\n' for row in rows).encode('utf-8')
+
+
 class TSVManager:
     """TSV file management"""
     
-    def __init__(self, tsv_path: Path):
+    def __init__(self, tsv_path: Path, expected_header: Optional[List[str]] = None):
         """Initialize TSV manager
         
         Args:
             tsv_path: Path to the TSV file
+            expected_header: Header written by the current schema; a file whose
+                first line matches it exactly skips header tokenization on load
         """
         self._tsv_path = tsv_path
+        self._expected_header = expected_header
+        self._expected_header_line = '\t'.join(expected_header) + '\n' if expected_header else None
         self.header: List[str] = []
         self.data: List[List[str]] = []
     
@@ -46,37 +73,56 @@ class TSVManager:
             self.data = []
             return
         
-        with open(self.tsv_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # Parse header and data
-        if lines:
-            self.header = lines[0].strip().split('\t')
-            self.data = []
-            for line in lines[1:]:
-                line = line.strip()
-                if line:
-                    self.data.append(line.split('\t'))
-        else:
-            self.header = []
-            self.data = []
+        with open(self.tsv_path, 'r', encoding='utf-8', newline='', buffering=READ_BUFFER_SIZE) as f:
+            # Compare the header line as a whole; only other headers are tokenized
+            first_line = f.readline()
+            if first_line == self._expected_header_line:
+                self.header = list(self._expected_header)
+            else:
+                self.header = next(csv.reader([first_line], delimiter='\t', quoting=csv.QUOTE_NONE), [])
+            
+            # Tokenize in a single C-level pass; fields are never quoted
+            reader = csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE)
+            
+            # Parse data rows as written; subclasses check row widths themselves
+            self.data = [row for row in reader if row]
     
     def save(self) -> None:
         """Save data to TSV file"""
-        # Save to temporary file
+        # Serialize header and data in a single join
+        rows = [self.header] if self.header else []
+        rows.extend(self.data)
+        content = encode_tsv_rows([list(map(sanitize_tsv_field, row)) for row in rows])
+        
+        # Save to temporary file with a single write
         temp_path = self.tsv_path.with_suffix('.tmp')
-        with open(temp_path, 'w', encoding='utf-8') as f:
-            # Write header
-            if self.header:
-                sanitized_header = [sanitize_tsv_field(field) for field in self.header]
-                f.write('\t'.join(sanitized_header) + '\n')
-            
-            # Write data
-            for row in self.data:
-                sanitized_row = [sanitize_tsv_field(field) for field in row]
-                f.write('\t'.join(sanitized_row) + '\n')
+        with open(temp_path, 'wb') as f:
+            f.write(content)
         
         # Atomic operation with rename
         if self.tsv_path.exists():
             self.tsv_path.unlink()
-        temp_path.rename(self.tsv_path)
\ No newline at end of file
+        temp_path.rename(self.tsv_path)
+    
+    def append(self, rows: List[List[str]]) -> None:
+        """Append rows to the end of the TSV file
+        
+        The file must already exist with a header written by save().
+        Appended rows are also added to data so it mirrors the file.
+        If an interrupted write left the last line without a newline, the
+        line is terminated first so it is not merged with the first new row.
+        
+        Args:
+            rows: Rows to append
+        """
+        sanitized_rows = [list(map(sanitize_tsv_field, row)) for row in rows]
+        content = encode_tsv_rows(sanitized_rows)
+        
+        with open(self.tsv_path, 'a+b') as f:
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    content = b'\n' + content
+            f.write(content)
+        
+        self.data.extend(sanitized_rows)
\ No newline at end of file
@@ -14,15 +14,37 @@ import time
 import traceback
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import BinaryIO, Callable, Iterable, List, Optional
 from urllib.parse import urlparse
 
 from .download import PLAYWRIGHT_AVAILABLE, download, is_text, user_agent
 
+# File extension at the end of a URL, checked before each Playwright fetch
+_EXTENSION_RE = re.compile(r'(\.[a-zA-Z0-9]{1,5})$')
 
-@dataclass
+# Chunk size for streaming response bodies to disk
+FETCH_CHUNK_SIZE = 1 << 16
+
+
+def _extract_domain(url: str) -> str:
+    """Return the lowercased network location of url, or "" if it has none"""
+    if not url:
+        return ""
+    try:
+        return urlparse(url).netloc.lower()
+    except Exception as e:
+        print("URL domain extraction failed, setting empty domain", file=sys.stderr)
+        traceback.print_exc()
+        return ""
+
+
+@dataclass(slots=True)
 class URLInfo:
-    """Class representing cached file information"""
+    """Class representing cached file information
+    
+    Uses __slots__ because one instance exists per cache row.
+    Fields stay mutable: fetching updates entries in place.
+    """
     url: str
     filename: str
     fetch_date: str
@@ -35,23 +57,19 @@ class URLInfo:
     
     def __post_init__(self):
         """Generate hash and domain after initialization"""
-        self.hash = hashlib.md5(self.url.encode('utf-8')).hexdigest()
-        if not self.url:
-            self.domain = ""
-        else:
-            try:
-                parsed = urlparse(self.url)
-                self.domain = parsed.netloc.lower()
-            except Exception as e:
-                print("URL domain extraction failed, setting empty domain", file=sys.stderr)
-                traceback.print_exc()
-                self.domain = ""
+        # MD5 only derives filenames; usedforsecurity=False allows the fast path on FIPS builds
+        self.hash = hashlib.md5(self.url.encode('utf-8'), usedforsecurity=False).hexdigest()
+        self.domain = _extract_domain(self.url)
     
-    def to_tsv_line(self) -> str:
-        """Serialize to TSV line format"""
+    def to_tsv_row(self) -> List[str]:
+        """Serialize to TSV field list"""
         # Escape tabs and newlines in error messages
         safe_error = self.error.replace('\t', ' ').replace('\n', ' ').replace('\r', '')
-        return f"{self.url}\t{self.hash}\t{self.filename}\t{self.fetch_date}\t{self.status}\t{self.content_type}\t{self.size}\t{safe_error}"
+        return [self.url, self.hash, self.filename, self.fetch_date, self.status, self.content_type, str(self.size), safe_error]
+    
+    def to_tsv_line(self) -> str:
+        """Serialize to TSV line format"""
+        return '\t'.join(self.to_tsv_row())
     
     @classmethod
     def from_tsv_line(cls, line: str) -> 'URLInfo':
@@ -59,7 +77,11 @@ class URLInfo:
         parts = line.strip().split('\t')
         if len(parts) < 7:
             raise ValueError(f"Invalid TSV line: {line}")
-        
+        return cls.from_tsv_row(parts)
+    
+    @classmethod
+    def from_tsv_row(cls, parts: List[str]) -> 'URLInfo':
+        """Deserialize from TSV field list (at least 7 fields)"""
         # Error field may be empty
         error = parts[7] if len(parts) > 7 else ""
         
@@ -77,49 +99,88 @@ class URLInfo:
         instance.hash = parts[1]
         return instance
     
-    def fetch_content(self, use_playwright: bool = False) -> str | bytes:
+    def fetch_content_to(self, open_output: Callable[[], BinaryIO], use_playwright: bool = False) -> int:
         """
-        Fetch content from URL
+        Fetch content from URL and write it to a file
+        
+        Responses fetched with requests are streamed in chunks, so the body is
+        never held in memory as a whole.
         
         Args:
+            open_output: Called once content_type is known; returns a binary
+                file object, which is closed after writing
             use_playwright: Whether to use Playwright for dynamic rendering
+        
+        Returns:
+            int: Number of bytes written
         """
-        if use_playwright and PLAYWRIGHT_AVAILABLE:
-            # Detect binary files when using Playwright
-            match = re.search(r'(\.[a-zA-Z0-9]{1,5})$', self.url)
-            if match:
-                extension = match.group(1).lower()
-                mime_type, _ = mimetypes.guess_type('file' + extension)
-                
-                # Use requests if MIME type is detected and not text
-                if mime_type and not is_text(mime_type):
-                    print(f"Binary file detected ({mime_type}): using requests")
-                    return self._fetch_content_requests()
-            
+        if self._should_use_playwright(use_playwright):
             # Use Playwright for dynamic rendering
             try:
                 content_type, content = download(self.url)
                 self.content_type = content_type
-                return content
             except Exception as e:
                 print("Playwright failed, falling back to requests", file=sys.stderr)
                 traceback.print_exc()
-                return self._fetch_content_requests()
-        else:
-            # Use requests
-            return self._fetch_content_requests()
+            else:
+                with open_output() as f:
+                    f.write(content)
+                return len(content)
+        
+        # Use requests
+        return self._fetch_content_requests_to(open_output)
     
-    def _fetch_content_requests(self) -> bytes:
-        """Fetch content using requests library"""
-        headers = {'User-Agent': user_agent}
+    def _should_use_playwright(self, use_playwright: bool) -> bool:
+        """Check whether Playwright should render this URL"""
+        if not (use_playwright and PLAYWRIGHT_AVAILABLE):
+            return False
         
-        response = requests.get(self.url, headers=headers, timeout=30)
-        response.raise_for_status()
+        # Detect binary files when using Playwright
+        match = _EXTENSION_RE.search(self.url)
+        if match:
+            extension = match.group(1).lower()
+            mime_type, _ = mimetypes.guess_type('file' + extension)
+            
+            # Use requests if MIME type is detected and not text
+            if mime_type and not is_text(mime_type):
+                print(f"Binary file detected ({mime_type}): using requests")
+                return False
+        return True
+    
+    def _fetch_content_requests_to(self, open_output: Callable[[], BinaryIO]) -> int:
+        """Stream content to a file using requests library"""
+        headers = {'User-Agent': user_agent}
         
-        # Update content type from response
-        self.content_type = response.headers.get('content-type', '').split(';')[0].strip()
+        with requests.get(self.url, headers=headers, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            
+            # Update content type from response
+            self.content_type = response.headers.get('content-type', '').split(';')[0].strip()
+            
+            size = 0
+            with open_output() as f:
+                for chunk in response.iter_content(FETCH_CHUNK_SIZE):
+                    f.write(chunk)
+                    size += len(chunk)
+            return size
+
+
+def _load_urls_from_stream(stream: Iterable[str]) -> list[str]:
+    """
+    Collect URLs from lines, skipping blank lines and '#' comments
+    
+    Args:
+        stream: Iterable of text lines (open file, sys.stdin, io.StringIO)
         
-        return response.content
+    Returns:
+        List of URLs
+    """
+    urls = []
+    for line in stream:
+        url = line.strip()
+        if url and not url.startswith('#'):
+            urls.append(url)
+    return urls
 
 
 def load_urls_from_file(filepath: str) -> list[str]:
@@ -132,27 +193,15 @@ def load_urls_from_file(filepath: str) -> list[str]:
     Returns:
         List of URLs
     """
-    import sys
-    
-    urls = []
-    
     if filepath == '-':
         # Read from stdin
-        for line in sys.stdin:
-            url = line.strip()
-            if url and not url.startswith('#'):
-                urls.append(url)
-    else:
-        # Read from file
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                for line in f:
-                    url = line.strip()
-                    if url and not url.startswith('#'):
-                        urls.append(url)
-        except Exception as e:
-            print(f"Error: Cannot read URL file: {filepath}", file=sys.stderr)
-            traceback.print_exc()
-            sys.exit(1)
+        return _load_urls_from_stream(sys.stdin)
     
-    return urls
+    # Read from file
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return _load_urls_from_stream(f)
+    except Exception as e:
+        print(f"Error: Cannot read URL file: {filepath}", file=sys.stderr)
+        traceback.print_exc()
+        sys.exit(1)
@@ -5,6 +5,7 @@ HTML processing utilities
 Provides HTML content preprocessing and text extraction functionality.
 """
 
+import os
 import re
 import html
 from pathlib import Path
@@ -14,12 +15,18 @@ from importlib import resources
 # Default cache directory name
 DEFAULT_CACHE_DIR = "url2md-cache"
 
+# HTML patterns, compiled once for every page processed
+_BODY_RE = re.compile(r'<body[^>]*>(.*?)</body>', re.DOTALL | re.IGNORECASE)
+_SCRIPT_RE = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+_STYLE_RE = re.compile(r'<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.DOTALL | re.IGNORECASE)
+
 
 def extract_body_content(html_content: str) -> str:
     """Extract innerHTML from body tag and remove script and style tags"""
     try:
         # Extract body tag content
-        body_match = re.search(r'<body[^>]*>(.*?)</body>', html_content, re.DOTALL | re.IGNORECASE)
+        body_match = _BODY_RE.search(html_content)
         if body_match:
             body_content = body_match.group(1)
         else:
@@ -27,8 +34,8 @@ def extract_body_content(html_content: str) -> str:
             body_content = html_content
         
         # Remove script and style tags
-        body_content = re.sub(r'<script[^>]*>.*?</script>', '', body_content, flags=re.DOTALL | re.IGNORECASE)
-        body_content = re.sub(r'<style[^>]*>.*?</style>', '', body_content, flags=re.DOTALL | re.IGNORECASE)
+        body_content = _SCRIPT_RE.sub('', body_content)
+        body_content = _STYLE_RE.sub('', body_content)
         
         return body_content.strip()
     except Exception:
@@ -40,7 +47,7 @@ def extract_html_title(html_content: str) -> str:
     """Extract title tag content from HTML"""
     try:
         # Extract title tag content (case insensitive)
-        title_match = re.search(r'<title[^>]*>(.*?)</title>', html_content, re.DOTALL | re.IGNORECASE)
+        title_match = _TITLE_RE.search(html_content)
         if title_match:
             title = title_match.group(1).strip()
             # Decode HTML entities
@@ -64,8 +71,7 @@ def find_cache_dir() -> Path:
     current_dir = Path.cwd()
     
     # First, check if default cache directory exists in current directory
-    default_cache = current_dir / DEFAULT_CACHE_DIR
-    default_tsv = default_cache / "cache.tsv"
+    default_tsv = current_dir / DEFAULT_CACHE_DIR / "cache.tsv"
     try:
         if default_tsv.exists():
             return Path(DEFAULT_CACHE_DIR)  # Return relative path for current directory
@@ -75,13 +81,12 @@ def find_cache_dir() -> Path:
     # Check current directory and parent directories for cache.tsv
     for directory in [current_dir] + list(current_dir.parents):
         try:
-            # Look for cache.tsv in any subdirectory
-            for path in directory.iterdir():
-                if path.is_dir():
-                    tsv_file = path / "cache.tsv"
+            # Look for cache.tsv in any subdirectory (scandir avoids a stat per entry)
+            with os.scandir(directory) as entries:
+                for entry in entries:
                     try:
-                        if tsv_file.exists():
-                            return path
+                        if entry.is_dir() and os.path.exists(os.path.join(entry.path, "cache.tsv")):
+                            return Path(entry.path)
                     except Exception:
                         # Skip directories we can't access
                         continue